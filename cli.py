@@ -4,10 +4,13 @@ Command Line Interface for GrowPodEmpire
 
 import sys
 import os
+import shutil
 import argparse
 from datetime import datetime
+from functools import lru_cache
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+sys.path.insert(0, SRC_DIR)
 
 from growpodempire.app import GrowPodEmpire
 from growpodempire.models import EnvironmentalCondition, GrowthStage
@@ -27,12 +30,12 @@ def list_pods_cmd(args, empire):
         print("No pods found.")
         return
     
-    print(f"\n{'ID':<15} {'Name':<30} {'Capacity':<10} {'Current':<10} {'Status'}")
-    print("-" * 80)
+    lines = [f"\n{'ID':<15} {'Name':<30} {'Capacity':<10} {'Current':<10} {'Status'}", "-" * 80]
     for pod in pods:
         status = "Active" if pod.active else "Inactive"
-        print(f"{pod.id:<15} {pod.name:<30} {pod.capacity:<10} {len(pod.current_plants):<10} {status}")
-    print()
+        lines.append(f"{pod.id:<15} {pod.name:<30} {pod.capacity:<10} {len(pod.current_plants):<10} {status}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def add_plant_cmd(args, empire):
@@ -51,13 +54,14 @@ def list_plants_cmd(args, empire):
         print("No plants found.")
         return
     
-    print(f"\n{'ID':<15} {'Strain':<20} {'Stage':<15} {'Height':<10} {'Health':<10} {'Pod'}")
-    print("-" * 95)
+    lines = [f"\n{'ID':<15} {'Strain':<20} {'Stage':<15} {'Height':<10} {'Health':<10} {'Pod'}", "-" * 95]
     for plant in plants:
+        stage = plant.growth_stage.value
         height = f"{plant.height:.1f}cm" if plant.height else "N/A"
         health = f"{plant.health_score:.1f}" if plant.health_score else "N/A"
-        print(f"{plant.id:<15} {plant.strain:<20} {plant.growth_stage.value:<15} {height:<10} {health:<10} {plant.pod_id}")
-    print()
+        lines.append(f"{plant.id:<15} {plant.strain:<20} {stage:<15} {height:<10} {health:<10} {plant.pod_id}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def record_growth_cmd(args, empire):
@@ -77,37 +81,72 @@ def show_stats_cmd(args, empire):
     """Show system statistics"""
     stats = empire.get_system_stats()
     
-    print("\n" + "=" * 60)
-    print("  GrowPodEmpire System Statistics")
-    print("=" * 60)
-    print(f"\nPods:")
-    print(f"  Total: {stats['total_pods']}")
-    print(f"  Active: {stats['active_pods']}")
-    
-    print(f"\nPlants:")
-    print(f"  Total: {stats['total_plants']}")
-    print(f"  Active: {stats['active_plants']}")
-    
-    print(f"\nPlants by Growth Stage:")
+    lines = [
+        f"\n{'=' * 60}",
+        "  GrowPodEmpire System Statistics",
+        "=" * 60,
+        "\nPods:",
+        f"  Total: {stats['total_pods']}",
+        f"  Active: {stats['active_pods']}",
+        "\nPlants:",
+        f"  Total: {stats['total_plants']}",
+        f"  Active: {stats['active_plants']}",
+        "\nPlants by Growth Stage:",
+    ]
     for stage, count in stats['plants_by_stage'].items():
         if count > 0:
-            print(f"  {stage}: {count}")
+            lines.append(f"  {stage}: {count}")
     
-    print(f"\nBlockchain:")
-    print(f"  Total Blocks: {stats['blockchain']['total_blocks']}")
-    print(f"  Data Integrity: {'✓ Valid' if stats['data_integrity'] else '✗ Invalid'}")
-    print()
+    lines += [
+        "\nBlockchain:",
+        f"  Total Blocks: {stats['blockchain']['total_blocks']}",
+        f"  Data Integrity: {'✓ Valid' if stats['data_integrity'] else '✗ Invalid'}",
+        "",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def serve_api_cmd(args, empire):
     """Start API server"""
     print(f"Starting GrowPodEmpire API server on {args.host}:{args.port}...")
-    app = create_app()
-    app.run(host=args.host, port=args.port, debug=args.debug)
-
-
-def main():
-    """Main CLI entry point"""
+    gunicorn = shutil.which('gunicorn')
+    if args.debug or gunicorn is None:
+        # Werkzeug development server (single process, debugger enabled)
+        app = create_app(empire)
+        app.run(host=args.host, port=args.port, debug=args.debug)
+        return
+    
+    # State lives in process memory, so every worker holds its own empire;
+    # concurrency comes from threads within each worker
+    os.environ['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [SRC_DIR, os.environ.get('PYTHONPATH')])
+    )
+    os.execv(gunicorn, [
+        'gunicorn',
+        '--workers', str(args.workers),
+        '--worker-class', 'gthread',
+        '--threads', str(args.threads),
+        '--bind', f"{args.host}:{args.port}",
+        '--preload',
+        'growpodempire.api.flask_api:create_app()',
+    ])
+
+
+# Command dispatch
+COMMANDS = {
+    'create-pod': create_pod_cmd,
+    'list-pods': list_pods_cmd,
+    'add-plant': add_plant_cmd,
+    'list-plants': list_plants_cmd,
+    'record-growth': record_growth_cmd,
+    'stats': show_stats_cmd,
+    'serve': serve_api_cmd,
+}
+
+
+@lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (constructed once per process)"""
     parser = argparse.ArgumentParser(
         description='GrowPodEmpire - Professional Cannabis Cultivation Management Platform',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -157,32 +196,27 @@ Examples:
     serve_parser = subparsers.add_parser('serve', help='Start API server')
     serve_parser.add_argument('--host', default='0.0.0.0', help='Host address')
     serve_parser.add_argument('--port', type=int, default=5000, help='Port number')
-    serve_parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    serve_parser.add_argument('--debug', action='store_true', help='Enable debug mode (development server)')
+    serve_parser.add_argument('--workers', type=int, default=1,
+                              help='Worker processes; each keeps separate in-memory state')
+    serve_parser.add_argument('--threads', type=int, default=8, help='Request threads per worker')
     
+    return parser
+
+
+def main():
+    """Main CLI entry point"""
+    parser = _build_parser()
     args = parser.parse_args()
     
-    if not args.command:
+    command = COMMANDS.get(args.command)
+    if command is None:
         parser.print_help()
         return
     
-    # Initialize empire
-    empire = GrowPodEmpire()
-    
-    # Command dispatch
-    commands = {
-        'create-pod': create_pod_cmd,
-        'list-pods': list_pods_cmd,
-        'add-plant': add_plant_cmd,
-        'list-plants': list_plants_cmd,
-        'record-growth': record_growth_cmd,
-        'stats': show_stats_cmd,
-        'serve': serve_api_cmd,
-    }
-    
-    if args.command in commands:
-        commands[args.command](args, empire)
-    else:
-        parser.print_help()
+    # The API server initializes its own empire in the serving process
+    empire = None if command is serve_api_cmd else GrowPodEmpire()
+    command(args, empire)
 
 
 if __name__ == '__main__':
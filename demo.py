@@ -137,12 +137,12 @@ def demo_growpod_empire():
     # System statistics
     print_section("8. System Statistics")
     stats = empire.get_system_stats()
-    print(f"📊 Platform Overview:")
+    print("📊 Platform Overview:")
     print(f"   - Total Pods: {stats['total_pods']}")
     print(f"   - Active Plants: {stats['active_plants']}")
     print(f"   - Total Blockchain Blocks: {stats['blockchain']['total_blocks']}")
     print(f"   - Data Integrity Verified: {stats['data_integrity']}")
-    print(f"\n   Plants by Growth Stage:")
+    print("\n   Plants by Growth Stage:")
     for stage, count in stats['plants_by_stage'].items():
         if count > 0:
             print(f"   - {stage}: {count}")
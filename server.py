@@ -1,15 +1,23 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request
 import os
 
 from growpodempire.app import GrowPodEmpire
+from growpodempire.api.flask_api import json_response
 from growpodempire.models import GrowthStage, EnvironmentalCondition
 
 app = Flask(__name__)
 engine = GrowPodEmpire()
 
+# Pod fields exposed by this API
+POD_KEYS = ("id", "name", "capacity", "active", "current_plants")
+
+def pod_row(pod):
+    fields = pod.__dict__
+    return {key: fields[key] for key in POD_KEYS}
+
 @app.get("/")
 def health_check():
-    return jsonify({"status": "GROWv2 API running"})
+    return json_response({"status": "GROWv2 API running"})
 
 @app.post("/pods")
 def create_pod():
@@ -19,12 +27,12 @@ def create_pod():
         name=data["name"],
         capacity=data["capacity"]
     )
-    return jsonify({"pod": pod.__dict__})
+    return json_response({"pod": pod_row(pod)})
 
 @app.get("/pods")
 def list_pods():
     pods = engine.list_pods()
-    return jsonify([p.__dict__ for p in pods])
+    return json_response([pod_row(p) for p in pods])
 
 @app.post("/plants")
 def add_plant():
@@ -34,7 +42,7 @@ def add_plant():
         strain=data["strain"],
         pod_id=data["pod_id"]
     )
-    return jsonify({"plant": plant.__dict__})
+    return json_response({"plant": plant.fast_dict()})
 
 @app.post("/growth")
 def record_growth():
@@ -44,12 +52,12 @@ def record_growth():
         height=data["height"],
         leaf_count=data.get("leaf_count")
     )
-    return jsonify(result)
+    return json_response(result)
 
 @app.get("/analytics/plant/<plant_id>")
 def get_analytics(plant_id):
     stats = engine.get_growth_analytics(plant_id)
-    return jsonify(stats)
+    return json_response(stats)
 
 # More endpoints can be added similarly
 
@@ -16,5 +16,7 @@ setup(
         "python-dotenv>=1.0.0",
         "numpy>=1.26.2",
         "pandas>=2.1.4",
+        "orjson>=3.8.0",
+        "gunicorn>=21.2.0",
     ],
 )
@@ -2,6 +2,6 @@
 API package initialization
 """
 
-from .flask_api import create_app
+from .flask_api import create_app, json_response
 
-__all__ = ['create_app']
+__all__ = ['create_app', 'json_response']
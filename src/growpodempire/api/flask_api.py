@@ -3,25 +3,147 @@ Flask API for GrowPodEmpire
 RESTful API endpoints for the cultivation platform
 """
 
-from flask import Flask, request, jsonify
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+import orjson
+from flask import Flask, request, current_app, g
 from flask_cors import CORS
 from datetime import datetime
-from ..app import GrowPodEmpire
+from typing import Optional
+from ..app import GrowPodEmpire, pin_request_time, release_request_time
 from ..models import EnvironmentalCondition, GrowthStage
+from ..serialization import json_default
 
+# Seconds a computed /api/stats payload is reused for polling bursts (any
+# write clears it sooner)
+STATS_CACHE_TTL = 1.0
 
-def create_app():
-    """Create and configure Flask application"""
+
+class _ReadWriteLock:
+    """Lets any number of readers in at once, or a single writer
+    
+    Waiting writers hold back new readers, so a steady stream of GETs
+    cannot starve the writes queued behind them.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writing = False
+    
+    @contextmanager
+    def reading(self):
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def writing(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class _LockedChunks:
+    """Streamed response body that takes the read lock for each chunk
+    
+    The lock is not held between chunks, so a client that stops reading
+    never blocks writers; each chunk is still encoded from a consistent
+    state.
+    """
+    
+    def __init__(self, chunks, lock: _ReadWriteLock):
+        self._chunks = iter(chunks)
+        self._lock = lock
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        with self._lock.reading():
+            return next(self._chunks)
+
+
+def json_response(obj, status: int = 200):
+    """Build a JSON response for the current app using orjson"""
+    body = orjson.dumps(obj, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+
+def create_app(empire: Optional[GrowPodEmpire] = None):
+    """Create and configure Flask application
+    
+    Serves `empire` if given, otherwise a freshly initialized GrowPodEmpire.
+    """
     app = Flask(__name__)
     CORS(app)
     
     # Initialize GrowPodEmpire
-    empire = GrowPodEmpire()
+    if empire is None:
+        empire = GrowPodEmpire()
+    
+    # (computed_at, payload) for the most recent /api/stats response
+    stats_cache = (0.0, None)
+    
+    # Threaded servers run requests concurrently; writes go one at a time
+    # so block numbering and pod capacity checks stay consistent, and reads
+    # wait for them because writers update the chain, JSON caches and
+    # NumPy series in several steps
+    state_lock = _ReadWriteLock()
+    
+    def locked_view(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            nonlocal stats_cache
+            if request.method not in ('GET', 'HEAD'):
+                with state_lock.writing():
+                    try:
+                        return view(*args, **kwargs)
+                    finally:
+                        # Writes change the counts /api/stats reports
+                        stats_cache = (0.0, None)
+            with state_lock.reading():
+                response = view(*args, **kwargs)
+            if response.is_streamed:
+                response.response = _LockedChunks(response.response, state_lock)
+            return response
+        return wrapper
+    
+    # Read the clock once per request; every timestamp it produces agrees
+    @app.before_request
+    def pin_time():
+        g.request_time_token = pin_request_time()
+    
+    @app.teardown_request
+    def release_time(exc):
+        token = g.pop('request_time_token', None)
+        if token is not None:
+            release_request_time(token)
     
     @app.route('/')
     def index():
         """API root endpoint"""
-        return jsonify({
+        return json_response({
             "name": "GrowPodEmpire API",
             "version": "1.0.0",
             "description": "Professional Cannabis Cultivation Management Platform",
@@ -36,6 +158,7 @@ def create_app():
     
     # Pod Endpoints
     @app.route('/api/pods', methods=['GET', 'POST'])
+    @locked_view
     def pods():
         if request.method == 'POST':
             data = request.json
@@ -44,20 +167,21 @@ def create_app():
                 name=data['name'],
                 capacity=data['capacity']
             )
-            return jsonify(pod.model_dump()), 201
+            return json_response(pod, 201)
         else:
-            pods_list = empire.list_pods()
-            return jsonify([p.model_dump() for p in pods_list])
+            return app.response_class(empire.render_pods_json(), mimetype='application/json')
     
     @app.route('/api/pods/<pod_id>', methods=['GET'])
+    @locked_view
     def get_pod(pod_id):
         pod = empire.get_pod(pod_id)
         if pod:
-            return jsonify(pod.model_dump())
-        return jsonify({"error": "Pod not found"}), 404
+            return json_response(pod)
+        return json_response({"error": "Pod not found"}, 404)
     
     # Plant Endpoints
     @app.route('/api/plants', methods=['GET', 'POST'])
+    @locked_view
     def plants():
         if request.method == 'POST':
             data = request.json
@@ -67,33 +191,36 @@ def create_app():
                     strain=data['strain'],
                     pod_id=data['pod_id']
                 )
-                return jsonify(plant.model_dump()), 201
+                return json_response(plant, 201)
             except ValueError as e:
-                return jsonify({"error": str(e)}), 400
+                return json_response({"error": str(e)}, 400)
         else:
             pod_id = request.args.get('pod_id')
-            plants_list = empire.list_plants(pod_id=pod_id)
-            return jsonify([p.model_dump() for p in plants_list])
+            # Streamed so only one encoded plant is in flight at a time
+            return app.response_class(empire.iter_plants_json(pod_id=pod_id), mimetype='application/json')
     
     @app.route('/api/plants/<plant_id>', methods=['GET'])
+    @locked_view
     def get_plant(plant_id):
         plant = empire.get_plant(plant_id)
         if plant:
-            return jsonify(plant.model_dump())
-        return jsonify({"error": "Plant not found"}), 404
+            return json_response(plant)
+        return json_response({"error": "Plant not found"}, 404)
     
     @app.route('/api/plants/<plant_id>/stage', methods=['PUT'])
+    @locked_view
     def update_plant_stage(plant_id):
         data = request.json
         try:
             stage = GrowthStage(data['stage'])
             plant = empire.update_plant_stage(plant_id, stage)
-            return jsonify(plant.model_dump())
+            return json_response(plant)
         except (ValueError, KeyError) as e:
-            return jsonify({"error": str(e)}), 400
+            return json_response({"error": str(e)}, 400)
     
     # Growth Tracking Endpoints
     @app.route('/api/plants/<plant_id>/growth', methods=['POST'])
+    @locked_view
     def record_growth(plant_id):
         data = request.json
         try:
@@ -102,34 +229,38 @@ def create_app():
                 height=data['height'],
                 leaf_count=data.get('leaf_count')
             )
-            return jsonify(metrics), 201
+            return json_response(metrics, 201)
         except ValueError as e:
-            return jsonify({"error": str(e)}), 400
+            return json_response({"error": str(e)}, 400)
     
     @app.route('/api/plants/<plant_id>/analytics', methods=['GET'])
+    @locked_view
     def get_growth_analytics(plant_id):
         analytics = empire.get_growth_analytics(plant_id)
-        return jsonify(analytics)
+        return json_response(analytics)
     
     # Environmental Monitoring Endpoints
     @app.route('/api/environment/<pod_id>', methods=['POST'])
+    @locked_view
     def record_environment(pod_id):
         data = request.json
         try:
             conditions = EnvironmentalCondition(**data)
             result = empire.record_environment(pod_id, conditions)
-            return jsonify(result), 201
+            return json_response(result, 201)
         except (ValueError, TypeError) as e:
-            return jsonify({"error": str(e)}), 400
+            return json_response({"error": str(e)}, 400)
     
     @app.route('/api/environment/<pod_id>/analytics', methods=['GET'])
+    @locked_view
     def get_environment_analytics(pod_id):
         hours = int(request.args.get('hours', 24))
         analytics = empire.get_environment_analytics(pod_id, hours)
-        return jsonify(analytics)
+        return json_response(analytics)
     
     # Harvest Endpoints
     @app.route('/api/plants/<plant_id>/harvest', methods=['POST'])
+    @locked_view
     def record_harvest(plant_id):
         data = request.json
         try:
@@ -138,31 +269,41 @@ def create_app():
                 yield_amount=data['yield_amount'],
                 quality_score=data['quality_score']
             )
-            return jsonify(result), 201
+            return json_response(result, 201)
         except (ValueError, KeyError) as e:
-            return jsonify({"error": str(e)}), 400
+            return json_response({"error": str(e)}, 400)
     
     # Blockchain Endpoints
     @app.route('/api/blockchain/info', methods=['GET'])
+    @locked_view
     def blockchain_info():
         info = empire.get_blockchain_info()
-        return jsonify(info)
+        return json_response(info)
     
     @app.route('/api/blockchain/plant/<plant_id>', methods=['GET'])
+    @locked_view
     def plant_blockchain_history(plant_id):
         history = empire.get_plant_history(plant_id)
-        return jsonify(history)
+        return json_response(history)
     
     @app.route('/api/blockchain/verify', methods=['GET'])
+    @locked_view
     def verify_blockchain():
-        is_valid = empire.verify_data_integrity()
-        return jsonify({"valid": is_valid})
+        # Explicit verification requests audit the whole chain
+        is_valid = empire.verify_data_integrity(full=True)
+        return json_response({"valid": is_valid})
     
     # System Stats
     @app.route('/api/stats', methods=['GET'])
+    @locked_view
     def system_stats():
-        stats = empire.get_system_stats()
-        return jsonify(stats)
+        nonlocal stats_cache
+        computed_at, stats = stats_cache
+        now = time.monotonic()
+        if stats is None or now - computed_at > STATS_CACHE_TTL:
+            stats = empire.get_system_stats()
+            stats_cache = (now, stats)
+        return json_response(stats)
     
     return app
 
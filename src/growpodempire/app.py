@@ -3,11 +3,34 @@ Main Application Manager for GrowPodEmpire
 Coordinates all services and provides high-level interface
 """
 
-from typing import Dict, List, Optional
+from collections import Counter, defaultdict
+from contextvars import ContextVar, Token
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+import numpy as np
+import orjson
 from .models import Plant, GrowPod, EnvironmentalCondition, GrowthStage
 from .services import GrowthTracker, EnvironmentalMonitor
+from .services.environmental_monitor import CONDITION_COLUMNS
 from .blockchain import CultivationBlockchain
+from .blockchain.cultivation_chain import HashFn, sha256_digest
+
+# Growth stages counted as active, with their JSON keys, fixed at import
+_ACTIVE_STAGES = tuple((stage.value, stage) for stage in GrowthStage if stage is not GrowthStage.HARVEST)
+_HARVEST_KEY = GrowthStage.HARVEST.value
+
+# Wall-clock time pinned for the current request (per thread/context)
+_request_time: ContextVar[Optional[datetime]] = ContextVar("request_time", default=None)
+
+
+def pin_request_time(now: Optional[datetime] = None) -> Token:
+    """Pin the time GrowPodEmpire uses for the rest of the current request"""
+    return _request_time.set(now or datetime.now())
+
+
+def release_request_time(token: Token):
+    """Undo a pin_request_time() call"""
+    _request_time.reset(token)
 
 
 class GrowPodEmpire:
@@ -16,18 +39,31 @@ class GrowPodEmpire:
     Professional Cannabis Cultivation Management Platform
     """
     
-    def __init__(self):
+    def __init__(self, hash_fn: HashFn = sha256_digest):
         self.plants: Dict[str, Plant] = {}
         self.pods: Dict[str, GrowPod] = {}
         self.growth_tracker = GrowthTracker()
         self.environmental_monitor = EnvironmentalMonitor()
-        self.blockchain = CultivationBlockchain()
+        self.blockchain = CultivationBlockchain(hash_fn=hash_fn)
+        # Running plant counts per growth stage, kept in step with every
+        # stage transition so stats never have to rescan all plants
+        self._stage_counts: Dict[GrowthStage, int] = Counter()
+        # Plant IDs ever added to each pod, in planting order
+        self._plants_by_pod: Dict[str, List[str]] = defaultdict(list)
+        # Pre-encoded JSON per object; entries are dropped on mutation
+        self._pod_json_cache: Dict[str, bytes] = {}
+        self._plant_json_cache: Dict[str, bytes] = {}
+    
+    def _now(self) -> datetime:
+        """Current time, shared by every operation within a pinned request"""
+        return _request_time.get() or datetime.now()
     
     # Pod Management
     def create_pod(self, pod_id: str, name: str, capacity: int) -> GrowPod:
         """Create a new growing pod"""
         pod = GrowPod(id=pod_id, name=name, capacity=capacity)
         self.pods[pod_id] = pod
+        self._invalidate_json(self._pod_json_cache, pod_id)
         return pod
     
     def get_pod(self, pod_id: str) -> Optional[GrowPod]:
@@ -41,6 +77,36 @@ class GrowPodEmpire:
     # Plant Management
     def add_plant(self, plant_id: str, strain: str, pod_id: str) -> Plant:
         """Add a new plant to a pod"""
+        plant = self._place_plant(plant_id, strain, pod_id)
+        
+        # Record on blockchain
+        self.blockchain.record_plant_data(plant_id, {
+            "action": "planted",
+            "strain": strain,
+            "pod_id": pod_id
+        })
+        
+        return plant
+    
+    def add_plants_batch(self, plants: List[Tuple[str, str, str]]) -> List[Plant]:
+        """Add several (plant_id, strain, pod_id) plants, recording them in one batch
+        
+        Plants placed before an invalid entry are kept and recorded before
+        its error is raised.
+        """
+        placed = []
+        try:
+            for plant_id, strain, pod_id in plants:
+                placed.append(self._place_plant(plant_id, strain, pod_id))
+        finally:
+            self.blockchain.record_plant_data_batch([
+                (plant.id, {"action": "planted", "strain": plant.strain, "pod_id": plant.pod_id})
+                for plant in placed
+            ])
+        return placed
+    
+    def _place_plant(self, plant_id: str, strain: str, pod_id: str) -> Plant:
+        """Create a plant in a pod and update the indexes, without recording it"""
         if pod_id not in self.pods:
             raise ValueError(f"Pod {pod_id} not found")
         
@@ -52,19 +118,19 @@ class GrowPodEmpire:
             id=plant_id,
             strain=strain,
             pod_id=pod_id,
-            planted_date=datetime.now()
+            planted_date=self._now()
         )
         
+        replaced = self.plants.get(plant_id)
+        if replaced is not None:
+            self._stage_counts[replaced.growth_stage] -= 1
+            self._plants_by_pod[replaced.pod_id].remove(plant_id)
         self.plants[plant_id] = plant
+        self._plants_by_pod[pod_id].append(plant_id)
+        self._stage_counts[plant.growth_stage] += 1
         pod.current_plants.append(plant_id)
-        
-        # Record on blockchain
-        self.blockchain.record_plant_data(plant_id, {
-            "action": "planted",
-            "strain": strain,
-            "pod_id": pod_id
-        })
-        
+        self._invalidate_json(self._plant_json_cache, plant_id)
+        self._invalidate_json(self._pod_json_cache, pod_id)
         return plant
     
     def get_plant(self, plant_id: str) -> Optional[Plant]:
@@ -73,10 +139,9 @@ class GrowPodEmpire:
     
     def list_plants(self, pod_id: Optional[str] = None) -> List[Plant]:
         """List all plants, optionally filtered by pod"""
-        plants = list(self.plants.values())
         if pod_id:
-            plants = [p for p in plants if p.pod_id == pod_id]
-        return plants
+            return [self.plants[pid] for pid in self._plants_by_pod.get(pod_id, ())]
+        return list(self.plants.values())
     
     def update_plant_stage(self, plant_id: str, stage: GrowthStage) -> Plant:
         """Update plant growth stage"""
@@ -86,6 +151,9 @@ class GrowPodEmpire:
         plant = self.plants[plant_id]
         old_stage = plant.growth_stage
         plant.growth_stage = stage
+        self._stage_counts[old_stage] -= 1
+        self._stage_counts[stage] += 1
+        self._invalidate_json(self._plant_json_cache, plant_id)
         
         # Record stage change on blockchain
         self.blockchain.record_plant_data(plant_id, {
@@ -108,6 +176,7 @@ class GrowPodEmpire:
         # Update plant data
         plant.height = height
         plant.health_score = metrics.health_score
+        self._invalidate_json(self._plant_json_cache, plant_id)
         
         # Record on blockchain
         self.blockchain.record_plant_data(plant_id, {
@@ -119,6 +188,42 @@ class GrowPodEmpire:
         
         return metrics.model_dump()
     
+    def record_growth_batch(self, plant_id: str, samples: List[Tuple[float, Optional[int]]],
+                            timestamps: Optional[List[datetime]] = None) -> List[Dict]:
+        """Record several (height, leaf_count) measurements as one blockchain block
+        
+        Samples without `timestamps` are all stamped now, so no growth rate
+        is derived between them.
+        """
+        if plant_id not in self.plants:
+            raise ValueError(f"Plant {plant_id} not found")
+        if not samples:
+            return []
+        if timestamps is None:
+            timestamps = [self._now()] * len(samples)
+        
+        plant = self.plants[plant_id]
+        heights, leaf_counts = zip(*samples)
+        batch = self.growth_tracker.track_growth_bulk(plant, heights, timestamps, leaf_counts)
+        plant.height = batch[-1].height
+        plant.health_score = batch[-1].health_score
+        self._invalidate_json(self._plant_json_cache, plant_id)
+        
+        # Record on blockchain
+        self.blockchain.record_plant_data(plant_id, {
+            "action": "growth_measurements",
+            "measurements": [
+                {
+                    "height": metrics.height,
+                    "health_score": metrics.health_score,
+                    "growth_rate": metrics.growth_rate
+                }
+                for metrics in batch
+            ]
+        })
+        
+        return [metrics.model_dump() for metrics in batch]
+    
     def get_growth_analytics(self, plant_id: str) -> Dict:
         """Get growth analytics for a plant"""
         return self.growth_tracker.get_growth_analytics(plant_id)
@@ -133,9 +238,42 @@ class GrowPodEmpire:
         
         # Update pod current conditions
         self.pods[pod_id].current_conditions = conditions
+        self._invalidate_json(self._pod_json_cache, pod_id)
+        
+        # Record on blockchain
+        self.blockchain.record_environmental_data(pod_id, conditions.fast_dict())
+        
+        return result
+    
+    def record_environment_batch(self, pod_id: str, readings: np.ndarray,
+                                 timestamps: Optional[List[datetime]] = None) -> Dict:
+        """Record a run of readings for a pod as one blockchain block
+        
+        `readings` is a NumPy structured array with one field per condition
+        column; readings without `timestamps` are all stamped now.
+        """
+        if pod_id not in self.pods:
+            raise ValueError(f"Pod {pod_id} not found")
+        if len(readings) == 0:
+            return {"recorded": 0, "critical_samples": {}}
+        if timestamps is None:
+            timestamps = [self._now()] * len(readings)
+        
+        values = np.vstack([readings[name] for name in CONDITION_COLUMNS]).astype(np.float64)
+        result = self.environmental_monitor.record_conditions_batch(pod_id, values, timestamps)
+        
+        # Update pod current conditions from the latest reading
+        self.pods[pod_id].current_conditions = EnvironmentalCondition(
+            timestamp=timestamps[-1],
+            **dict(zip(CONDITION_COLUMNS, values[:, -1].tolist()))
+        )
+        self._invalidate_json(self._pod_json_cache, pod_id)
         
         # Record on blockchain
-        self.blockchain.record_environmental_data(pod_id, conditions.model_dump())
+        self.blockchain.record_environmental_data(pod_id, {
+            "timestamps": [moment.isoformat() for moment in timestamps],
+            **dict(zip(CONDITION_COLUMNS, values.tolist()))
+        })
         
         return result
     
@@ -150,15 +288,19 @@ class GrowPodEmpire:
             raise ValueError(f"Plant {plant_id} not found")
         
         plant = self.plants[plant_id]
+        self._stage_counts[plant.growth_stage] -= 1
+        self._stage_counts[GrowthStage.HARVEST] += 1
         plant.growth_stage = GrowthStage.HARVEST
+        self._invalidate_json(self._plant_json_cache, plant_id)
         
+        now = self._now()
         harvest_data = {
             "plant_id": plant_id,
             "strain": plant.strain,
-            "harvest_date": datetime.now().isoformat(),
+            "harvest_date": now.isoformat(),
             "yield_amount": yield_amount,
             "quality_score": quality_score,
-            "days_to_harvest": (datetime.now() - plant.planted_date).days
+            "days_to_harvest": (now - plant.planted_date).days
         }
         
         # Record on blockchain
@@ -169,12 +311,45 @@ class GrowPodEmpire:
             pod = self.pods[plant.pod_id]
             if plant_id in pod.current_plants:
                 pod.current_plants.remove(plant_id)
+                self._invalidate_json(self._pod_json_cache, plant.pod_id)
         
         return {
             **harvest_data,
             "blockchain_record": blockchain_record.model_dump()
         }
     
+    # JSON Rendering
+    def render_pods_json(self) -> bytes:
+        """Render all pods as a JSON array"""
+        return self._render_json_array(self.pods.values(), self._pod_json_cache)
+    
+    def render_plants_json(self, pod_id: Optional[str] = None) -> bytes:
+        """Render plants as a JSON array, optionally filtered by pod"""
+        return b"".join(self.iter_plants_json(pod_id=pod_id))
+    
+    def iter_plants_json(self, pod_id: Optional[str] = None) -> Iterator[bytes]:
+        """Yield the plants JSON array piece by piece for streamed responses"""
+        return self._iter_json_array(self.list_plants(pod_id=pod_id), self._plant_json_cache)
+    
+    def _invalidate_json(self, cache: Dict[str, bytes], key: str):
+        """Drop the cached encoding of an object that has just changed"""
+        cache.pop(key, None)
+    
+    def _render_json_array(self, items: Iterable, cache: Dict[str, bytes]) -> bytes:
+        return b"".join(self._iter_json_array(items, cache))
+    
+    def _iter_json_array(self, items: Iterable, cache: Dict[str, bytes]) -> Iterator[bytes]:
+        """Yield cached per-object JSON, encoding only objects not yet cached"""
+        yield b"["
+        separator = b""
+        for item in items:
+            encoded = cache.get(item.id)
+            if encoded is None:
+                encoded = cache[item.id] = orjson.dumps(item.fast_dict())
+            yield separator + encoded
+            separator = b","
+        yield b"]"
+    
     # Blockchain Operations
     def get_blockchain_info(self) -> Dict:
         """Get blockchain information"""
@@ -184,24 +359,33 @@ class GrowPodEmpire:
         """Get complete blockchain history for a plant"""
         return self.blockchain.get_records_by_id(plant_id)
     
-    def verify_data_integrity(self) -> bool:
-        """Verify blockchain data integrity"""
-        return self.blockchain.verify_chain()
+    def verify_data_integrity(self, full: bool = False, batch_leaves: Optional[List[int]] = None,
+                              lazy: bool = False) -> bool:
+        """Verify blockchain data integrity (`full` re-hashes every block)
+        
+        With `batch_leaves`, only those block numbers are re-hashed and
+        checked against the Merkle root with a single multi-leaf proof;
+        `lazy` only checks that the newest block links to its parent.
+        """
+        if lazy:
+            return self.blockchain.verify_tip()
+        if batch_leaves is not None:
+            return self.blockchain.verify_blocks(batch_leaves)
+        return self.blockchain.verify_chain(full=full)
     
     # System Stats
     def get_system_stats(self) -> Dict:
         """Get overall system statistics"""
-        active_plants = [p for p in self.plants.values() if p.growth_stage != GrowthStage.HARVEST]
+        stage_counts = self._stage_counts
+        plants_by_stage = {key: stage_counts[stage] for key, stage in _ACTIVE_STAGES}
+        plants_by_stage[_HARVEST_KEY] = 0  # harvested plants are not active
         
         return {
             "total_pods": len(self.pods),
-            "active_pods": len([p for p in self.pods.values() if p.active]),
+            "active_pods": sum(1 for p in self.pods.values() if p.active),
             "total_plants": len(self.plants),
-            "active_plants": len(active_plants),
-            "plants_by_stage": {
-                stage.value: len([p for p in active_plants if p.growth_stage == stage])
-                for stage in GrowthStage
-            },
+            "active_plants": len(self.plants) - stage_counts[GrowthStage.HARVEST],
+            "plants_by_stage": plants_by_stage,
             "blockchain": self.blockchain.get_chain_info(),
             "data_integrity": self.verify_data_integrity()
         }
@@ -4,153 +4,413 @@ Provides immutable record keeping for cultivation data
 """
 
 import hashlib
-import json
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import os
+import struct
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
+import orjson
 from ..models import BlockchainRecord
+from ..serialization import json_default
+
+# Block header: block number, timestamp in microseconds since the
+# (naive) Unix epoch, and the raw previous hash
+_HEADER = struct.Struct("<Qq32s")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Number of blocks to re-hash at or above which verification uses threads
+PARALLEL_VERIFY_MIN_BLOCKS = 4096
+
+# Hashes are raw 32-byte SHA-256 digests, hex-encoded only at the API boundary
+GENESIS_PREVIOUS_HASH = b"\x00" * 32
+
+# Maps bytes to a raw digest; used for block hashes and Merkle nodes
+HashFn = Callable[[bytes], bytes]
+
+
+def sha256_digest(payload: bytes) -> bytes:
+    """Raw SHA-256 digest, the default hash function"""
+    return hashlib.sha256(payload).digest()
+
+
+def _canonical_json_bytes(data: Any) -> bytes:
+    """Compact, key-sorted UTF-8 JSON used as the hashed form of block data
+    
+    orjson walks the data in native code (datetimes become ISO-8601) and
+    only calls back into Python for types it does not know.
+    """
+    return orjson.dumps(data, default=json_default, option=orjson.OPT_SORT_KEYS)
 
 
 class Block:
     """Individual block in the blockchain"""
     
-    def __init__(self, block_number: int, data: Dict[str, Any], previous_hash: str):
+    # Chains hold one Block per record, so skip the per-instance __dict__
+    __slots__ = ("block_number", "timestamp", "data", "previous_hash", "hash",
+                 "record_type", "record_id", "_header_fields", "_header", "_hash_fn")
+    
+    def __init__(self, block_number: int, data: Dict[str, Any], previous_hash: bytes,
+                 timestamp: Optional[datetime] = None, hash_fn: HashFn = sha256_digest):
         self.block_number = block_number
-        self.timestamp = datetime.now()
+        self.timestamp = timestamp if timestamp is not None else datetime.now()
         self.data = data
+        # Lookup keys read once from the data rather than on every query
+        self.record_type = data.get("type", "unknown")
+        self.record_id = str(data.get("id", "unknown"))
         self.previous_hash = previous_hash
+        self._header_fields = None
+        self._header = b""
+        self._hash_fn = hash_fn
         self.hash = self.calculate_hash()
     
-    def calculate_hash(self) -> str:
-        """Calculate block hash"""
-        # Convert datetime objects to strings in data
-        serializable_data = self._make_serializable(self.data)
-        block_string = json.dumps({
-            "block_number": self.block_number,
-            "timestamp": self.timestamp.isoformat(),
-            "data": serializable_data,
-            "previous_hash": self.previous_hash
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
-    
-    def _make_serializable(self, obj):
-        """Convert objects to JSON serializable format"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: self._make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_serializable(item) for item in obj]
-        return obj
+    def _header_bytes(self) -> bytes:
+        """Serialized header fields, rebuilt only if one of them was changed"""
+        fields = (self.block_number, self.timestamp, self.previous_hash)
+        if fields != self._header_fields:
+            self._header = _HEADER.pack(
+                self.block_number,
+                (self.timestamp - _EPOCH) // _MICROSECOND,
+                self.previous_hash
+            )
+            self._header_fields = fields
+        return self._header
+    
+    def calculate_hash(self) -> bytes:
+        """Calculate the raw block hash (SHA-256 unless another hash_fn was given)"""
+        # The data is re-serialized every time so edits to it are detected;
+        # it is the last field, so it needs no length prefix
+        return self._hash_fn(self._header_bytes() + _canonical_json_bytes(self.data))
     
     def to_record(self) -> BlockchainRecord:
         """Convert block to blockchain record"""
         return BlockchainRecord(
-            record_id=str(self.data.get("id", "unknown")),
-            record_type=self.data.get("type", "unknown"),
-            data_hash=self.hash,
-            previous_hash=self.previous_hash,
+            record_id=self.record_id,
+            record_type=self.record_type,
+            data_hash=self.hash.hex(),
+            previous_hash=self.previous_hash.hex(),
             timestamp=self.timestamp,
             block_number=self.block_number
         )
 
 
+def _hash_blocks_in_parallel(blocks: List[Block], workers: int) -> List[bytes]:
+    """Recompute block hashes in one contiguous slice per thread
+    
+    Blocks hash independently, and hashlib releases the GIL while digesting
+    large inputs; per-slice tasks keep executor overhead off each block.
+    """
+    size = -(-len(blocks) // workers)
+    slices = [blocks[i:i + size] for i in range(0, len(blocks), size)]
+    with ThreadPoolExecutor(max_workers=len(slices)) as pool:
+        results = pool.map(lambda part: [block.calculate_hash() for block in part], slices)
+        return [block_hash for part in results for block_hash in part]
+
+
 class CultivationBlockchain:
     """Blockchain system for cannabis cultivation data integrity"""
     
-    def __init__(self):
+    def __init__(self, hash_fn: HashFn = sha256_digest):
+        # Tests that never check hashes may pass a cheap stand-in for SHA-256
+        self.hash_fn = hash_fn
         self.chain: List[Block] = []
+        # Index of the last block already verified; blocks are append-only,
+        # so verification only needs to cover blocks added since
+        self._verified_through = 0
+        # Merkle tree over block hashes, leaves first; each level holds the
+        # raw digests of the level below paired up (an odd node is promoted)
+        self._merkle_levels: List[List[bytes]] = [[]]
+        # Root of the last completed update, what readers are given
+        self._merkle_root = b""
+        # Block numbers per record type and per plant/pod id (genesis excluded)
+        self._by_type: Dict[str, List[int]] = defaultdict(list)
+        self._by_id: Dict[str, List[int]] = defaultdict(list)
         self.create_genesis_block()
     
     def create_genesis_block(self):
         """Create the first block in the chain"""
-        genesis_block = Block(0, {"type": "genesis", "data": "GrowPodEmpire Genesis Block"}, "0")
+        genesis_block = Block(0, {"type": "genesis", "data": "GrowPodEmpire Genesis Block"}, GENESIS_PREVIOUS_HASH,
+                              hash_fn=self.hash_fn)
         self.chain.append(genesis_block)
+        self._extend_merkle_leaves([genesis_block.hash])
     
     def get_latest_block(self) -> Block:
         """Get the most recent block"""
         return self.chain[-1]
     
-    def add_block(self, data: Dict[str, Any]) -> BlockchainRecord:
+    def add_block(self, data: Dict[str, Any], timestamp: Optional[datetime] = None) -> BlockchainRecord:
         """Add a new block to the chain"""
         previous_block = self.get_latest_block()
         new_block = Block(
             block_number=len(self.chain),
             data=data,
-            previous_hash=previous_block.hash
+            previous_hash=previous_block.hash,
+            timestamp=timestamp,
+            hash_fn=self.hash_fn
         )
         self.chain.append(new_block)
+        self._index_block(new_block)
+        self._extend_merkle_leaves([new_block.hash])
         return new_block.to_record()
     
+    def add_blocks(self, data_items: Iterable[Dict[str, Any]],
+                   timestamp: Optional[datetime] = None) -> List[BlockchainRecord]:
+        """Add several blocks to the chain, updating the Merkle tree once"""
+        chain = self.chain
+        previous_hash = chain[-1].hash
+        now = timestamp if timestamp is not None else datetime.now()
+        new_blocks = []
+        for data in data_items:
+            block = Block(block_number=len(chain), data=data, previous_hash=previous_hash, timestamp=now,
+                          hash_fn=self.hash_fn)
+            chain.append(block)
+            self._index_block(block)
+            new_blocks.append(block)
+            previous_hash = block.hash
+        
+        self._extend_merkle_leaves([block.hash for block in new_blocks])
+        return [block.to_record() for block in new_blocks]
+    
+    def _index_block(self, block: Block):
+        """Add a block to the record type and id indexes"""
+        self._by_type[block.record_type].append(block.block_number)
+        self._by_id[block.record_id].append(block.block_number)
+    
+    # Merkle Tree
+    def _extend_merkle_leaves(self, block_hashes: List[bytes]):
+        """Append leaves and recompute only the parents to their right
+        
+        A single leaf touches just the right spine (O(log n)); a batch shares
+        the recomputation of every parent the new leaves have in common.
+        """
+        if not block_hashes:
+            return
+        levels = self._merkle_levels
+        hash_fn = self.hash_fn
+        first = len(levels[0])
+        levels[0].extend(block_hashes)
+        
+        depth = 0
+        while len(levels[depth]) > 1:
+            level = levels[depth]
+            
+            # Parents from the first touched pair onwards are stale; they are
+            # rebuilt aside and swapped in with one slice assignment, so a
+            # concurrent reader never sees a level shortened or empty
+            start = first // 2
+            parents = []
+            for index in range(start * 2, len(level), 2):
+                if index + 1 < len(level):
+                    parents.append(hash_fn(level[index] + level[index + 1]))
+                else:
+                    parents.append(level[index])
+            if depth + 1 == len(levels):
+                levels.append(parents)
+            else:
+                levels[depth + 1][start:] = parents
+            first = start
+            depth += 1
+        self._merkle_root = levels[-1][0]
+    
+    def get_merkle_root(self) -> str:
+        """Get the Merkle root over all block hashes"""
+        return self._merkle_root.hex()
+    
+    def prove_inclusion(self, block_number: int) -> List[Dict[str, str]]:
+        """Get the sibling hashes linking a block to the Merkle root"""
+        if not 0 <= block_number < len(self.chain):
+            raise ValueError(f"Block {block_number} not found")
+        
+        proof = []
+        index = block_number
+        for level in self._merkle_levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append({
+                    "hash": level[sibling].hex(),
+                    "position": "left" if sibling < index else "right"
+                })
+            index //= 2
+        return proof
+    
+    def prove_inclusion_multi(self, block_numbers: Iterable[int]) -> List[str]:
+        """Get the sibling hashes linking several blocks to the Merkle root
+        
+        Siblings that are themselves proven or derivable are left out, so k
+        blocks need at most about k * log(n / k) hashes instead of k * log(n).
+        """
+        known = sorted(set(block_numbers))
+        if not known or known[0] < 0 or known[-1] >= len(self.chain):
+            raise ValueError("Block numbers must be a non-empty selection of existing blocks")
+        
+        proof = []
+        for level in self._merkle_levels[:-1]:
+            known_set = set(known)
+            for index in known:
+                sibling = index ^ 1
+                if sibling < len(level) and sibling not in known_set:
+                    proof.append(level[sibling].hex())
+            known = sorted({index // 2 for index in known})
+        return proof
+    
+    @staticmethod
+    def verify_inclusion_multi(leaves: Dict[int, bytes], proof: List[str], merkle_root: str,
+                               leaf_count: int, hash_fn: HashFn = sha256_digest) -> bool:
+        """Check several block hashes against a Merkle root using one multi-leaf proof"""
+        nodes = dict(leaves)
+        siblings = iter(proof)
+        width = leaf_count
+        while width > 1:
+            parents = {}
+            for index in sorted(nodes):
+                if index // 2 in parents:
+                    continue  # Already combined with its left sibling
+                sibling = index ^ 1
+                if sibling >= width:
+                    parents[index // 2] = nodes[index]
+                    continue
+                if sibling in nodes:
+                    sibling_hash = nodes[sibling]
+                else:
+                    sibling_hex = next(siblings, None)
+                    if sibling_hex is None:
+                        return False
+                    sibling_hash = bytes.fromhex(sibling_hex)
+                if index % 2:
+                    parents[index // 2] = hash_fn(sibling_hash + nodes[index])
+                else:
+                    parents[index // 2] = hash_fn(nodes[index] + sibling_hash)
+            nodes = parents
+            width = (width + 1) // 2
+        return next(siblings, None) is None and nodes.get(0, b"").hex() == merkle_root
+    
+    def verify_blocks(self, block_numbers: Iterable[int]) -> bool:
+        """Re-hash selected blocks and check them against the Merkle root"""
+        block_numbers = list(block_numbers)
+        proof = self.prove_inclusion_multi(block_numbers)
+        leaves = {n: self.chain[n].calculate_hash() for n in block_numbers}
+        return self.verify_inclusion_multi(leaves, proof, self.get_merkle_root(), len(self.chain),
+                                           hash_fn=self.hash_fn)
+    
+    @staticmethod
+    def verify_inclusion(block_hash: str, proof: List[Dict[str, str]], merkle_root: str,
+                         hash_fn: HashFn = sha256_digest) -> bool:
+        """Check a hex block hash against a Merkle root using an inclusion proof"""
+        node = bytes.fromhex(block_hash)
+        for step in proof:
+            sibling = bytes.fromhex(step["hash"])
+            if step["position"] == "left":
+                node = hash_fn(sibling + node)
+            else:
+                node = hash_fn(node + sibling)
+        return node.hex() == merkle_root
+    
     def record_plant_data(self, plant_id: str, data: Dict[str, Any]) -> BlockchainRecord:
         """Record plant data on blockchain"""
+        now = datetime.now()
         block_data = {
             "type": "plant_data",
             "id": plant_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "data": data
         }
-        return self.add_block(block_data)
+        return self.add_block(block_data, timestamp=now)
+    
+    def record_plant_data_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[BlockchainRecord]:
+        """Record (plant_id, data) pairs as consecutive blocks with one timestamp"""
+        now = datetime.now()
+        stamp = now.isoformat()
+        return self.add_blocks(({
+            "type": "plant_data",
+            "id": plant_id,
+            "timestamp": stamp,
+            "data": data
+        } for plant_id, data in items), timestamp=now)
     
     def record_environmental_data(self, pod_id: str, data: Dict[str, Any]) -> BlockchainRecord:
         """Record environmental data on blockchain"""
+        now = datetime.now()
         block_data = {
             "type": "environmental_data",
             "id": pod_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "data": data
         }
-        return self.add_block(block_data)
+        return self.add_block(block_data, timestamp=now)
     
     def record_harvest(self, plant_id: str, harvest_data: Dict[str, Any]) -> BlockchainRecord:
         """Record harvest event on blockchain"""
+        now = datetime.now()
         block_data = {
             "type": "harvest",
             "id": plant_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "data": harvest_data
         }
-        return self.add_block(block_data)
+        return self.add_block(block_data, timestamp=now)
     
-    def verify_chain(self) -> bool:
-        """Verify the integrity of the blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
+    def verify_chain(self, full: bool = False) -> bool:
+        """Verify the integrity of the blockchain
+        
+        Blocks verified by an earlier call keep their cached hashes; pass
+        `full` to re-hash every block from genesis as a tamper audit.
+        """
+        chain = self.chain
+        start = 1 if full else self._verified_through + 1
+        blocks = chain[start:]
+        workers = os.cpu_count() or 1
+        if workers > 1 and len(blocks) >= PARALLEL_VERIFY_MIN_BLOCKS:
+            hashes = _hash_blocks_in_parallel(blocks, workers)
+        else:
+            hashes = map(Block.calculate_hash, blocks)
+        
+        for i, computed_hash in enumerate(hashes, start):
+            current_block = chain[i]
+            previous_block = chain[i - 1]
             
-            # Check if current block's hash is correct
-            if current_block.hash != current_block.calculate_hash():
+            # Check if current block's hash is correct, and if previous hash matches
+            if (current_block.hash != computed_hash
+                    or current_block.previous_hash != previous_block.hash):
+                self._verified_through = min(self._verified_through, i - 1)
                 return False
             
-            # Check if previous hash matches
-            if current_block.previous_hash != previous_block.hash:
-                return False
+            if i > self._verified_through:
+                self._verified_through = i
         
         return True
     
+    def verify_tip(self) -> bool:
+        """Check only that the newest block links to the one before it (O(1))"""
+        chain = self.chain
+        return len(chain) < 2 or chain[-1].previous_hash == chain[-2].hash
+    
     def get_records_by_type(self, record_type: str) -> List[Dict[str, Any]]:
         """Get all records of a specific type"""
         records = []
-        for block in self.chain[1:]:  # Skip genesis block
-            if block.data.get("type") == record_type:
-                records.append({
-                    "block_number": block.block_number,
-                    "timestamp": block.timestamp.isoformat(),
-                    "hash": block.hash,
-                    "data": block.data
-                })
+        chain = self.chain
+        for block_number in self._by_type.get(record_type, ()):
+            block = chain[block_number]
+            records.append({
+                "block_number": block.block_number,
+                "timestamp": block.timestamp.isoformat(),
+                "hash": block.hash.hex(),
+                "data": block.data
+            })
         return records
     
     def get_records_by_id(self, record_id: str) -> List[Dict[str, Any]]:
         """Get all records for a specific plant or pod"""
         records = []
-        for block in self.chain[1:]:  # Skip genesis block
-            if block.data.get("id") == record_id:
-                records.append({
-                    "block_number": block.block_number,
-                    "timestamp": block.timestamp.isoformat(),
-                    "hash": block.hash,
-                    "data": block.data
-                })
+        chain = self.chain
+        for block_number in self._by_id.get(record_id, ()):
+            block = chain[block_number]
+            records.append({
+                "block_number": block.block_number,
+                "timestamp": block.timestamp.isoformat(),
+                "hash": block.hash.hex(),
+                "data": block.data
+            })
         return records
     
     def get_chain_info(self) -> Dict[str, Any]:
@@ -158,9 +418,10 @@ class CultivationBlockchain:
         return {
             "total_blocks": len(self.chain),
             "is_valid": self.verify_chain(),
+            "merkle_root": self.get_merkle_root(),
             "latest_block": {
                 "number": self.chain[-1].block_number,
-                "hash": self.chain[-1].hash,
+                "hash": self.chain[-1].hash.hex(),
                 "timestamp": self.chain[-1].timestamp.isoformat()
             }
         }
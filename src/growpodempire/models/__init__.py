@@ -5,7 +5,7 @@ Data models for GrowPodEmpire platform
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class GrowthStage(str, Enum):
@@ -20,6 +20,10 @@ class GrowthStage(str, Enum):
 
 class EnvironmentalCondition(BaseModel):
     """Environmental monitoring data"""
+    # Readings are never edited once taken, so instances are immutable
+    # (and hashable) and can be shared between history and pods safely
+    model_config = ConfigDict(frozen=True)
+    
     timestamp: datetime = Field(default_factory=datetime.now)
     temperature: float = Field(description="Temperature in Celsius")
     humidity: float = Field(description="Relative humidity percentage")
@@ -27,9 +31,15 @@ class EnvironmentalCondition(BaseModel):
     light_intensity: float = Field(description="Light intensity in lumens")
     ph_level: float = Field(description="pH level of growing medium")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
+    def fast_dict(self) -> Dict[str, Any]:
+        """Field dict equivalent to model_dump(), built without pydantic's serializer"""
+        return {
+            "timestamp": self.timestamp,
+            "temperature": self.temperature,
+            "humidity": self.humidity,
+            "co2_level": self.co2_level,
+            "light_intensity": self.light_intensity,
+            "ph_level": self.ph_level,
         }
 
 
@@ -45,9 +55,18 @@ class Plant(BaseModel):
     notes: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
+    def fast_dict(self) -> Dict[str, Any]:
+        """Field dict equivalent to model_dump() (shares mutable values; for serialization)"""
+        return {
+            "id": self.id,
+            "strain": self.strain,
+            "growth_stage": self.growth_stage,
+            "planted_date": self.planted_date,
+            "pod_id": self.pod_id,
+            "height": self.height,
+            "health_score": self.health_score,
+            "notes": self.notes,
+            "metadata": self.metadata,
         }
 
 
@@ -60,6 +79,18 @@ class GrowPod(BaseModel):
     current_conditions: Optional[EnvironmentalCondition] = None
     active: bool = True
     
+    def fast_dict(self) -> Dict[str, Any]:
+        """Field dict equivalent to model_dump() (shares mutable values; for serialization)"""
+        conditions = self.current_conditions
+        return {
+            "id": self.id,
+            "name": self.name,
+            "capacity": self.capacity,
+            "current_plants": self.current_plants,
+            "current_conditions": conditions.fast_dict() if conditions is not None else None,
+            "active": self.active,
+        }
+    
     
 class GrowthMetrics(BaseModel):
     """Intelligent growth tracking metrics"""
@@ -70,11 +101,6 @@ class GrowthMetrics(BaseModel):
     health_score: float
     growth_rate: Optional[float] = None  # cm per day
     predicted_harvest_date: Optional[datetime] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class BlockchainRecord(BaseModel):
@@ -85,8 +111,3 @@ class BlockchainRecord(BaseModel):
     previous_hash: str
     timestamp: datetime = Field(default_factory=datetime.now)
     block_number: int
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
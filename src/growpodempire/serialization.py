@@ -0,0 +1,14 @@
+"""
+JSON Serialization Helpers
+Shared by canonical block hashing and API responses
+"""
+
+from typing import Any
+from pydantic import BaseModel
+
+
+def json_default(obj: Any) -> Any:
+    """Encode values orjson does not handle natively (models embedded in data)"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
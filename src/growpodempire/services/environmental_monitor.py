@@ -4,16 +4,127 @@ Monitors and analyzes environmental conditions
 """
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence
 import numpy as np
 from ..models import EnvironmentalCondition, GrowPod
 
+# Sensor readings stored per sample, in column order
+CONDITION_COLUMNS = ("temperature", "humidity", "co2_level", "light_intensity", "ph_level")
+_TEMPERATURE, _HUMIDITY, _CO2 = 0, 1, 2
+
+# Most recent samples retained per pod
+HISTORY_CAPACITY = 100_000
+
+
+def _timestamp_ns(moment: datetime) -> int:
+    """Exact Unix timestamp of a datetime in integer nanoseconds"""
+    seconds = int(moment.replace(microsecond=0).timestamp())
+    return seconds * 1_000_000_000 + moment.microsecond * 1_000
+
+
+class _ConditionSeries:
+    """Column-oriented (SoA) buffer of one pod's most recent environmental samples
+    
+    Live samples occupy the contiguous slice [start, stop) of preallocated
+    buffers. Storage grows up to twice the capacity; after that a full
+    buffer is compacted by moving the live slice to the front, which keeps
+    appends amortized O(1) and every window a plain slice.
+    """
+    
+    def __init__(self, capacity: int = HISTORY_CAPACITY, initial_size: int = 64):
+        self.capacity = capacity
+        self.start = 0
+        self.stop = 0
+        # Samples normally arrive in time order, which allows binary search
+        self.in_order = True
+        size = min(initial_size, 2 * capacity)
+        # Unix timestamps in nanoseconds, one per sample
+        self.timestamps = np.empty(size, dtype=np.int64)
+        # One contiguous float64 row per sensor column
+        self.values = np.empty((len(CONDITION_COLUMNS), size), dtype=np.float64)
+    
+    def append(self, conditions: EnvironmentalCondition):
+        """Append a sample, dropping the oldest one once at capacity"""
+        if self.stop == self.timestamps.shape[0]:
+            self._reserve(1)
+        
+        i = self.stop
+        timestamp = _timestamp_ns(conditions.timestamp)
+        if i > self.start and timestamp < self.timestamps[i - 1]:
+            self.in_order = False
+        self.timestamps[i] = timestamp
+        self.values[:, i] = [getattr(conditions, name) for name in CONDITION_COLUMNS]
+        self.stop = i + 1
+        if self.stop - self.start > self.capacity:
+            self.start += 1
+    
+    def extend(self, timestamps: np.ndarray, values: np.ndarray):
+        """Append a run of samples (int64 ns timestamps, columns x samples values)"""
+        k = timestamps.shape[0]
+        if k == 0:
+            return
+        if k > self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[:, -self.capacity:]
+            k = self.capacity
+        
+        # Drop the oldest samples first so the run always fits
+        overflow = len(self) + k - self.capacity
+        if overflow > 0:
+            self.start += overflow
+        if self.stop + k > self.timestamps.shape[0]:
+            self._reserve(k)
+        
+        i = self.stop
+        if ((i > self.start and timestamps[0] < self.timestamps[i - 1])
+                or (k > 1 and bool((np.diff(timestamps) < 0).any()))):
+            self.in_order = False
+        self.timestamps[i:i + k] = timestamps
+        self.values[:, i:i + k] = values
+        self.stop = i + k
+    
+    def _reserve(self, k: int):
+        """Move live samples to the front of (possibly larger) buffers to fit `k` more"""
+        start, stop = self.start, self.stop
+        count = stop - start
+        needed = count + k
+        size = self.timestamps.shape[0]
+        if needed * 2 > size and size < 2 * self.capacity:
+            size = min(max(2 * size, needed), 2 * self.capacity)
+            timestamps = np.empty(size, dtype=np.int64)
+            values = np.empty((len(CONDITION_COLUMNS), size), dtype=np.float64)
+        else:
+            timestamps, values = self.timestamps, self.values
+        
+        timestamps[:count] = self.timestamps[start:stop]
+        values[:, :count] = self.values[:, start:stop]
+        self.timestamps, self.values = timestamps, values
+        self.start, self.stop = 0, count
+    
+    def window(self, since: datetime, fallback: int = 10) -> np.ndarray:
+        """Columns of samples taken at or after `since`, else the last `fallback` samples"""
+        start, stop = self.start, self.stop
+        cutoff = _timestamp_ns(since)
+        if self.in_order:
+            # Binary search, and the window is a view rather than a copy
+            first = start + int(np.searchsorted(self.timestamps[start:stop], cutoff))
+            if first < stop:
+                return self.values[:, first:stop]
+        else:
+            in_window = self.timestamps[start:stop] >= cutoff
+            if in_window.any():
+                return self.values[:, start:stop][:, in_window]
+        return self.values[:, max(start, stop - fallback):stop]
+    
+    def __len__(self) -> int:
+        return self.stop - self.start
+
 
 class EnvironmentalMonitor:
     """Environmental monitoring and analysis system"""
     
-    def __init__(self):
-        self.condition_history: Dict[str, List[EnvironmentalCondition]] = {}
+    def __init__(self, history_capacity: int = HISTORY_CAPACITY):
+        self.history_capacity = history_capacity
+        self.condition_history: Dict[str, _ConditionSeries] = {}
         # Optimal ranges for cannabis cultivation
         self.optimal_ranges = {
             "temperature": (20, 28),  # Celsius
@@ -26,108 +137,138 @@ class EnvironmentalMonitor:
     def record_conditions(self, pod_id: str, conditions: EnvironmentalCondition) -> Dict:
         """Record environmental conditions and analyze"""
         if pod_id not in self.condition_history:
-            self.condition_history[pod_id] = []
+            self.condition_history[pod_id] = _ConditionSeries(self.history_capacity)
         
         self.condition_history[pod_id].append(conditions)
         
-        # Analyze conditions
+        # Analyze conditions once; alerts are derived from the statuses
         analysis = self._analyze_conditions(conditions)
         
         return {
             "recorded": True,
             "timestamp": conditions.timestamp.isoformat(),
             "analysis": analysis,
-            "alerts": self._generate_alerts(conditions)
+            "alerts": self._generate_alerts(analysis)
+        }
+    
+    def record_conditions_batch(self, pod_id: str, values: np.ndarray,
+                                timestamps: Sequence[datetime]) -> Dict:
+        """Record a run of readings given as a (columns x samples) array
+        
+        Readings skip per-sample models; the result counts how many samples
+        of each parameter fall in the critical band.
+        """
+        if values.shape != (len(CONDITION_COLUMNS), len(timestamps)):
+            raise ValueError("values must have one row per condition column and one column per timestamp")
+        
+        if pod_id not in self.condition_history:
+            self.condition_history[pod_id] = _ConditionSeries(self.history_capacity)
+        self.condition_history[pod_id].extend(
+            np.array([_timestamp_ns(timestamp) for timestamp in timestamps], dtype=np.int64),
+            values
+        )
+        
+        ranges = np.array([self.optimal_ranges[name] for name in CONDITION_COLUMNS], dtype=np.float64)
+        critical = (values < ranges[:, :1] * 0.9) | (values > ranges[:, 1:] * 1.1)
+        
+        return {
+            "recorded": len(timestamps),
+            "critical_samples": dict(zip(CONDITION_COLUMNS, critical.sum(axis=1).tolist()))
         }
     
     def _analyze_conditions(self, conditions: EnvironmentalCondition) -> Dict:
         """Analyze if conditions are within optimal ranges"""
         analysis = {}
         
-        for param, value in conditions.model_dump().items():
-            if param == "timestamp":
-                continue
+        # Every ranged parameter is a model field, so read it directly
+        # rather than dumping the whole model per reading
+        for param, (min_val, max_val) in self.optimal_ranges.items():
+            value = getattr(conditions, param)
+            
+            if min_val <= value <= max_val:
+                status = "optimal"
+            elif min_val * 0.9 <= value <= max_val * 1.1:
+                status = "acceptable"
+            else:
+                status = "critical"
             
-            if param in self.optimal_ranges:
-                min_val, max_val = self.optimal_ranges[param]
-                
-                if min_val <= value <= max_val:
-                    status = "optimal"
-                elif min_val * 0.9 <= value <= max_val * 1.1:
-                    status = "acceptable"
-                else:
-                    status = "critical"
-                
-                analysis[param] = {
-                    "value": value,
-                    "status": status,
-                    "optimal_range": f"{min_val}-{max_val}"
-                }
+            analysis[param] = {
+                "value": value,
+                "status": status,
+                "optimal_range": f"{min_val}-{max_val}"
+            }
         
         return analysis
     
-    def _generate_alerts(self, conditions: EnvironmentalCondition) -> List[str]:
-        """Generate alerts for critical conditions"""
+    def _generate_alerts(self, analysis: Dict) -> List[str]:
+        """Generate alerts for critical conditions from an existing analysis"""
         alerts = []
         
-        temp_min, temp_max = self.optimal_ranges["temperature"]
-        if conditions.temperature < temp_min * 0.9:
-            alerts.append(f"Temperature too low: {conditions.temperature}°C")
-        elif conditions.temperature > temp_max * 1.1:
-            alerts.append(f"Temperature too high: {conditions.temperature}°C")
+        # A critical status means the value is outside 90%-110% of its range
+        temperature = analysis["temperature"]
+        if temperature["status"] == "critical":
+            value = temperature["value"]
+            if value < self.optimal_ranges["temperature"][0]:
+                alerts.append(f"Temperature too low: {value}°C")
+            else:
+                alerts.append(f"Temperature too high: {value}°C")
         
-        hum_min, hum_max = self.optimal_ranges["humidity"]
-        if conditions.humidity < hum_min * 0.9:
-            alerts.append(f"Humidity too low: {conditions.humidity}%")
-        elif conditions.humidity > hum_max * 1.1:
-            alerts.append(f"Humidity too high: {conditions.humidity}%")
+        humidity = analysis["humidity"]
+        if humidity["status"] == "critical":
+            value = humidity["value"]
+            if value < self.optimal_ranges["humidity"][0]:
+                alerts.append(f"Humidity too low: {value}%")
+            else:
+                alerts.append(f"Humidity too high: {value}%")
         
-        ph_min, ph_max = self.optimal_ranges["ph_level"]
-        if conditions.ph_level < ph_min or conditions.ph_level > ph_max:
-            alerts.append(f"pH level out of range: {conditions.ph_level}")
+        # pH has no tolerance band: anything outside the range alerts
+        ph_level = analysis["ph_level"]
+        if ph_level["status"] != "optimal":
+            alerts.append(f"pH level out of range: {ph_level['value']}")
         
         return alerts
     
     def get_environment_analytics(self, pod_id: str, hours: int = 24) -> Dict:
         """Get environmental analytics for a pod over specified time period"""
-        history = self.condition_history.get(pod_id, [])
+        history = self.condition_history.get(pod_id)
         
         if not history:
             return {"error": "No environmental data available"}
         
         # Filter by time period
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_history = [c for c in history if c.timestamp >= cutoff_time]
-        
-        if not recent_history:
-            recent_history = history[-10:] if len(history) > 10 else history
+        window = history.window(cutoff_time)
         
-        # Calculate statistics
-        temps = [c.temperature for c in recent_history]
-        humidities = [c.humidity for c in recent_history]
-        co2_levels = [c.co2_level for c in recent_history]
+        # Calculate statistics over contiguous per-sensor columns
+        averages = window.mean(axis=1)
+        minimums = window.min(axis=1)
+        maximums = window.max(axis=1)
+        std_devs = window.std(axis=1)
+        latest = EnvironmentalCondition.model_construct(
+            **{name: float(value) for name, value in zip(CONDITION_COLUMNS, window[:, -1])}
+        )
         
         analytics = {
             "period_hours": hours,
-            "measurements": len(recent_history),
+            "measurements": window.shape[1],
             "temperature": {
-                "average": float(np.mean(temps)),
-                "min": float(np.min(temps)),
-                "max": float(np.max(temps)),
-                "std_dev": float(np.std(temps))
+                "average": float(averages[_TEMPERATURE]),
+                "min": float(minimums[_TEMPERATURE]),
+                "max": float(maximums[_TEMPERATURE]),
+                "std_dev": float(std_devs[_TEMPERATURE])
             },
             "humidity": {
-                "average": float(np.mean(humidities)),
-                "min": float(np.min(humidities)),
-                "max": float(np.max(humidities)),
-                "std_dev": float(np.std(humidities))
+                "average": float(averages[_HUMIDITY]),
+                "min": float(minimums[_HUMIDITY]),
+                "max": float(maximums[_HUMIDITY]),
+                "std_dev": float(std_devs[_HUMIDITY])
             },
             "co2": {
-                "average": float(np.mean(co2_levels)),
-                "min": float(np.min(co2_levels)),
-                "max": float(np.max(co2_levels)),
+                "average": float(averages[_CO2]),
+                "min": float(minimums[_CO2]),
+                "max": float(maximums[_CO2]),
             },
-            "overall_status": self._get_overall_status(recent_history[-1] if recent_history else None)
+            "overall_status": self._get_overall_status(latest)
         }
         
         return analytics
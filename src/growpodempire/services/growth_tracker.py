@@ -4,23 +4,119 @@ Analyzes plant growth patterns and provides predictions
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from types import MappingProxyType
+from typing import Optional, Dict, List, Mapping, Sequence
 import numpy as np
 from ..models import Plant, GrowthMetrics, GrowthStage
 
+# Stages in lifecycle order, and each stage's position in it
+_STAGES = tuple(GrowthStage)
+_STAGE_IDX = {stage: i for i, stage in enumerate(_STAGES)}
+
+
+class _GrowthSeries:
+    """Column-oriented (SoA) buffer of one plant's growth measurements"""
+    
+    def __init__(self, capacity: int = 16):
+        self.count = 0
+        self.timestamps = np.empty(capacity, dtype=np.float64)  # Unix seconds
+        self.heights = np.empty(capacity, dtype=np.float64)
+        self.growth_rates = np.empty(capacity, dtype=np.float64)  # NaN when unknown
+        self.latest: Optional[GrowthMetrics] = None
+        # Running aggregates, updated on append so analytics never re-scan
+        self.first_height = 0.0
+        self.min_height = float("inf")
+        self.height_sum = 0.0
+        self.rate_sum = 0.0
+        self.rate_count = 0
+    
+    def append(self, metrics: GrowthMetrics):
+        """Append a measurement, doubling the buffers when full"""
+        if self.count == self.timestamps.shape[0]:
+            self._grow(2 * self.count)
+        
+        i = self.count
+        self.timestamps[i] = metrics.timestamp.timestamp()
+        self.heights[i] = metrics.height
+        self.growth_rates[i] = np.nan if metrics.growth_rate is None else metrics.growth_rate
+        self.count = i + 1
+        self.latest = metrics
+        
+        if i == 0:
+            self.first_height = metrics.height
+        self.min_height = min(self.min_height, metrics.height)
+        self.height_sum += metrics.height
+        if metrics.growth_rate is not None:
+            self.rate_sum += metrics.growth_rate
+            self.rate_count += 1
+    
+    def extend(self, timestamps: np.ndarray, heights: np.ndarray, growth_rates: np.ndarray):
+        """Append a run of measurements column by column"""
+        k = timestamps.shape[0]
+        if self.count + k > self.timestamps.shape[0]:
+            self._grow(max(2 * self.count, self.count + k))
+        
+        i = self.count
+        self.timestamps[i:i + k] = timestamps
+        self.heights[i:i + k] = heights
+        self.growth_rates[i:i + k] = growth_rates
+        self.count = i + k
+        
+        if k:
+            if i == 0:
+                self.first_height = float(heights[0])
+            self.min_height = min(self.min_height, float(heights.min()))
+            self.height_sum += float(heights.sum())
+            known_rates = growth_rates[~np.isnan(growth_rates)]
+            self.rate_sum += float(known_rates.sum())
+            self.rate_count += known_rates.size
+    
+    def _grow(self, capacity: int):
+        for name in ("timestamps", "heights", "growth_rates"):
+            column = np.empty(capacity, dtype=np.float64)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+    
+    def __len__(self) -> int:
+        return self.count
+
+
+def _growth_update(last_time: float, last_height: float, now: float, height: float,
+                   health_score: float, expected_rate: float):
+    """Growth rate (cm per day) since the last measurement and the adjusted health score
+    
+    Times are Unix seconds; the rate is None when no time has passed.
+    """
+    time_diff = (now - last_time) / 86400  # days
+    if time_diff <= 0:
+        return None, health_score
+    
+    growth_rate = (height - last_height) / time_diff
+    return growth_rate, _adjust_health(growth_rate, health_score, expected_rate)
+
+
+def _adjust_health(growth_rate: float, health_score: float, expected_rate: float) -> float:
+    """Lower the health score for slow growth and raise it for fast growth"""
+    if growth_rate < expected_rate * 0.5:
+        return max(50, health_score - 10)
+    if growth_rate > expected_rate * 1.5:
+        return min(100, health_score + 5)
+    return health_score
+
 
 class GrowthTracker:
     """Intelligent growth tracking and prediction system"""
     
     def __init__(self):
-        self.growth_history: Dict[str, List[GrowthMetrics]] = {}
+        self.growth_history: Dict[str, _GrowthSeries] = {}
         # Average growth rates by stage (cm per day)
         self.stage_growth_rates = {
             GrowthStage.SEEDLING: 0.5,
             GrowthStage.VEGETATIVE: 2.0,
             GrowthStage.FLOWERING: 0.3,
         }
-        # Average stage durations (days)
+        # Average stage durations (days); assigning a new mapping rebuilds
+        # the days-to-harvest table
         self.stage_durations = {
             GrowthStage.SEED: 3,
             GrowthStage.GERMINATION: 7,
@@ -29,27 +125,48 @@ class GrowthTracker:
             GrowthStage.FLOWERING: 60,
         }
     
+    @property
+    def stage_durations(self) -> Mapping[GrowthStage, int]:
+        """Average stage durations in days (read-only; assign to change)"""
+        return self._stage_durations
+    
+    @stage_durations.setter
+    def stage_durations(self, durations: Mapping[GrowthStage, int]):
+        self._stage_durations = MappingProxyType(dict(durations))
+        self._cumulative_remaining = self._remaining_days_by_stage()
+    
+    def set_stage_duration(self, stage: GrowthStage, days: int):
+        """Change one stage's average duration"""
+        self.stage_durations = {**self._stage_durations, stage: days}
+    
+    def _remaining_days_by_stage(self) -> List[int]:
+        """Days left until harvest from the start of each stage"""
+        remaining = [0] * len(_STAGES)
+        total = 0
+        for i in range(_STAGE_IDX[GrowthStage.HARVEST] - 1, -1, -1):
+            total += self._stage_durations.get(_STAGES[i], 0)
+            remaining[i] = total
+        return remaining
+    
     def track_growth(self, plant: Plant, height: float, leaf_count: Optional[int] = None) -> GrowthMetrics:
         """Track plant growth and calculate metrics"""
-        plant_history = self.growth_history.get(plant.id, [])
+        plant_history = self.growth_history.get(plant.id)
+        if plant_history is None:
+            plant_history = self.growth_history[plant.id] = _GrowthSeries()
         
-        # Calculate growth rate
+        # Calculate growth rate, and health score based on it
         growth_rate = None
-        if plant_history:
-            last_metric = plant_history[-1]
-            time_diff = (datetime.now() - last_metric.timestamp).total_seconds() / 86400  # days
-            if time_diff > 0:
-                height_diff = height - last_metric.height
-                growth_rate = height_diff / time_diff
-        
-        # Calculate health score based on growth rate
         health_score = plant.health_score
-        if growth_rate is not None:
-            expected_rate = self.stage_growth_rates.get(plant.growth_stage, 1.0)
-            if growth_rate < expected_rate * 0.5:
-                health_score = max(50, health_score - 10)
-            elif growth_rate > expected_rate * 1.5:
-                health_score = min(100, health_score + 5)
+        if plant_history:
+            last = plant_history.count - 1
+            growth_rate, health_score = _growth_update(
+                float(plant_history.timestamps[last]),
+                float(plant_history.heights[last]),
+                datetime.now().timestamp(),
+                height,
+                health_score,
+                self.stage_growth_rates.get(plant.growth_stage, 1.0)
+            )
         
         # Predict harvest date
         predicted_harvest = self._predict_harvest_date(plant, plant_history)
@@ -64,28 +181,81 @@ class GrowthTracker:
         )
         
         # Store metrics
-        if plant.id not in self.growth_history:
-            self.growth_history[plant.id] = []
-        self.growth_history[plant.id].append(metrics)
+        plant_history.append(metrics)
         
         return metrics
     
-    def _predict_harvest_date(self, plant: Plant, history: List[GrowthMetrics]) -> datetime:
+    def track_growth_bulk(self, plant: Plant, heights: Sequence[float],
+                          timestamps: Sequence[datetime],
+                          leaf_counts: Optional[Sequence[Optional[int]]] = None) -> List[GrowthMetrics]:
+        """Track a run of timestamped measurements (e.g. a backfill) in one pass"""
+        if len(heights) != len(timestamps):
+            raise ValueError("heights and timestamps must have the same length")
+        if leaf_counts is None:
+            leaf_counts = [None] * len(heights)
+        elif len(leaf_counts) != len(heights):
+            raise ValueError("heights and leaf_counts must have the same length")
+        
+        plant_history = self.growth_history.get(plant.id)
+        if plant_history is None:
+            plant_history = self.growth_history[plant.id] = _GrowthSeries()
+        if not heights:
+            return []
+        
+        new_times = np.array([timestamp.timestamp() for timestamp in timestamps], dtype=np.float64)
+        new_heights = np.asarray(heights, dtype=np.float64)
+        
+        # Growth rates against the previous sample, all at once; the first
+        # sample of a fresh history has nothing to compare against
+        first = plant_history.count
+        if first:
+            times = np.concatenate((plant_history.timestamps[first - 1:first], new_times))
+            all_heights = np.concatenate((plant_history.heights[first - 1:first], new_heights))
+        else:
+            times = np.concatenate((new_times[:1], new_times))
+            all_heights = np.concatenate((new_heights[:1], new_heights))
+        time_diffs = np.diff(times) / 86400  # days
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth_rates = np.where(time_diffs > 0, np.diff(all_heights) / time_diffs, np.nan)
+        plant_history.extend(new_times, new_heights, growth_rates)
+        
+        # Health scores carry over from one sample to the next
+        expected_rate = self.stage_growth_rates.get(plant.growth_stage, 1.0)
+        health_score = plant.health_score
+        batch = []
+        for i, rate in enumerate(growth_rates.tolist()):
+            growth_rate = None if np.isnan(rate) else rate
+            if growth_rate is not None:
+                health_score = _adjust_health(growth_rate, health_score, expected_rate)
+            batch.append(GrowthMetrics(
+                plant_id=plant.id,
+                timestamp=timestamps[i],
+                height=heights[i],
+                leaf_count=leaf_counts[i],
+                health_score=health_score,
+                growth_rate=growth_rate,
+                predicted_harvest_date=self._predict_harvest_date(plant, plant_history, first + i)
+            ))
+        
+        plant_history.latest = batch[-1]
+        return batch
+    
+    def _predict_harvest_date(self, plant: Plant, history: _GrowthSeries,
+                              count: Optional[int] = None) -> datetime:
         """Predict harvest date based on current stage and growth rate"""
         days_since_planted = (datetime.now() - plant.planted_date).days
-        remaining_days = 0
         
         # Calculate remaining days based on current stage
-        current_stage_index = list(GrowthStage).index(plant.growth_stage)
-        for stage in list(GrowthStage)[current_stage_index:]:
-            if stage == GrowthStage.HARVEST:
-                break
-            remaining_days += self.stage_durations.get(stage, 0)
-        
-        # Adjust based on growth rate if available
-        if history and len(history) > 3:
-            recent_metrics = history[-5:]
-            avg_growth_rate = np.mean([m.growth_rate for m in recent_metrics if m.growth_rate])
+        remaining_days = self._cumulative_remaining[_STAGE_IDX[plant.growth_stage]]
+        
+        # Adjust based on growth rate if available, using only the first
+        # `count` measurements when given
+        n = history.count if count is None else count
+        if n > 3:
+            recent_rates = history.growth_rates[n - 5 if n > 5 else 0:n]
+            # Unknown (NaN) and zero rates are skipped
+            recent_rates = recent_rates[np.nan_to_num(recent_rates) != 0]
+            avg_growth_rate = recent_rates.mean() if recent_rates.size else np.nan
             expected_rate = self.stage_growth_rates.get(plant.growth_stage, 1.0)
             
             if avg_growth_rate > 0:
@@ -96,21 +266,25 @@ class GrowthTracker:
     
     def get_growth_analytics(self, plant_id: str) -> Dict:
         """Get comprehensive growth analytics for a plant"""
-        history = self.growth_history.get(plant_id, [])
+        history = self.growth_history.get(plant_id)
         
         if not history:
             return {"error": "No growth data available"}
         
-        heights = [m.height for m in history]
-        growth_rates = [m.growth_rate for m in history if m.growth_rate is not None]
+        # Built from the series' running aggregates, O(1) in history length
+        n = history.count
+        current_height = float(history.heights[n - 1])
+        latest = history.latest
         
         analytics = {
-            "total_measurements": len(history),
-            "current_height": heights[-1] if heights else 0,
-            "height_gained": heights[-1] - heights[0] if len(heights) > 1 else 0,
-            "average_growth_rate": float(np.mean(growth_rates)) if growth_rates else 0,
-            "current_health_score": history[-1].health_score,
-            "predicted_harvest": history[-1].predicted_harvest_date.isoformat() if history[-1].predicted_harvest_date else None,
+            "total_measurements": n,
+            "current_height": current_height,
+            "height_gained": current_height - history.first_height if n > 1 else 0,
+            "mean_height": history.height_sum / n,
+            "min_height": history.min_height,
+            "average_growth_rate": history.rate_sum / history.rate_count if history.rate_count else 0,
+            "current_health_score": latest.health_score,
+            "predicted_harvest": latest.predicted_harvest_date.isoformat() if latest.predicted_harvest_date else None,
         }
         
         return analytics
@@ -0,0 +1,55 @@
+"""
+Shared pytest fixtures for GrowPodEmpire tests
+"""
+
+import pytest
+from growpodempire.app import GrowPodEmpire
+
+
+def _prefix_hash(payload: bytes) -> bytes:
+    """Stand-in for SHA-256 in tests that never check hashes (the block number)"""
+    return payload[:8].ljust(8, b"\0")
+
+
+@pytest.fixture
+def empire():
+    """Fresh empire for tests that mutate state, without real hashing"""
+    return GrowPodEmpire(hash_fn=_prefix_hash)
+
+
+@pytest.fixture
+def crypto_empire():
+    """Fresh empire hashing with SHA-256, for tests that check integrity"""
+    return GrowPodEmpire()
+
+
+@pytest.fixture
+def empire_with_pod(empire):
+    """Fresh empire with a five-plant pod, pod-1"""
+    empire.create_pod("pod-1", "Test Pod", 5)
+    return empire
+
+
+@pytest.fixture
+def empire_with_plant(empire_with_pod):
+    """Fresh empire with a seed, plant-1, planted in pod-1"""
+    empire_with_pod.add_plant("plant-1", "OG Kush", "pod-1")
+    return empire_with_pod
+
+
+@pytest.fixture(scope="class")
+def class_empire():
+    """Empire with pod-1 and plant-1, shared by one test class (kept on one xdist worker by loadscope)"""
+    empire = GrowPodEmpire(hash_fn=_prefix_hash)
+    empire.create_pod("pod-1", "Test Pod", 5)
+    empire.add_plant("plant-1", "OG Kush", "pod-1")
+    return empire
+
+
+@pytest.fixture(scope="module")
+def populated_empire():
+    """Empire with one pod and one plant, shared by read-only tests in a module"""
+    empire = GrowPodEmpire(hash_fn=_prefix_hash)
+    empire.create_pod("pod-1", "Test Pod", 5)
+    empire.add_plant("plant-1", "OG Kush", "pod-1")
+    return empire
@@ -2,14 +2,20 @@
 Tests for GrowPodEmpire Core Functionality
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
+import hashlib
+import json
+import threading
+import numpy as np
 import pytest
-from datetime import datetime
-from growpodempire.app import GrowPodEmpire
-from growpodempire.models import EnvironmentalCondition, GrowthStage
+from pydantic import ValidationError
+from datetime import datetime, timedelta
+from growpodempire.api.flask_api import _ReadWriteLock, create_app
+from growpodempire.app import GrowPodEmpire, pin_request_time, release_request_time
+from growpodempire.blockchain import Block, cultivation_chain
+from growpodempire.models import EnvironmentalCondition, GrowthStage, GrowPod, Plant
+from growpodempire.services import EnvironmentalMonitor
+from growpodempire.services.environmental_monitor import CONDITION_COLUMNS
+from growpodempire.services.growth_tracker import _growth_update
 
 
 class TestGrowPodEmpire:
@@ -34,6 +40,30 @@ class TestGrowPodEmpire:
         pods = self.empire.list_pods()
         assert len(pods) == 2
     
+    def test_render_pods_json(self):
+        """Test rendered pod JSON reflects later mutations"""
+        self.empire.create_pod("pod-1", "Pod 1", 5)
+        pods = json.loads(self.empire.render_pods_json())
+        assert [p['id'] for p in pods] == ["pod-1"]
+        assert pods[0]['current_plants'] == []
+        
+        self.empire.add_plant("plant-1", "OG Kush", "pod-1")
+        pods = json.loads(self.empire.render_pods_json())
+        assert pods[0]['current_plants'] == ["plant-1"]
+    
+    def test_render_plants_json(self):
+        """Test rendered plant JSON filters by pod and tracks stage changes"""
+        self.empire.create_pod("pod-1", "Pod 1", 5)
+        self.empire.create_pod("pod-2", "Pod 2", 5)
+        self.empire.add_plant("plant-1", "OG Kush", "pod-1")
+        self.empire.add_plant("plant-2", "Blue Dream", "pod-2")
+        assert len(json.loads(self.empire.render_plants_json())) == 2
+        
+        self.empire.update_plant_stage("plant-1", GrowthStage.VEGETATIVE)
+        plants = json.loads(self.empire.render_plants_json(pod_id="pod-1"))
+        assert [p['id'] for p in plants] == ["plant-1"]
+        assert plants[0]['growth_stage'] == "vegetative"
+    
     def test_add_plant(self):
         """Test adding a plant"""
         self.empire.create_pod("pod-1", "Test Pod", 5)
@@ -43,6 +73,53 @@ class TestGrowPodEmpire:
         assert plant.pod_id == "pod-1"
         assert plant.growth_stage == GrowthStage.SEED
     
+    def test_add_plants_batch(self):
+        """Test batched planting indexes every plant and records one block each"""
+        self.empire.create_pod("pod-1", "Test Pod", 2)
+        blocks_before = len(self.empire.blockchain.chain)
+        
+        with pytest.raises(ValueError):
+            self.empire.add_plants_batch([
+                ("plant-1", "Strain A", "pod-1"),
+                ("plant-2", "Strain B", "pod-1"),
+                ("plant-3", "Strain C", "pod-1"),
+            ])
+        
+        # Plants placed before the full pod was hit are kept and recorded
+        assert [plant.id for plant in self.empire.list_plants("pod-1")] == ["plant-1", "plant-2"]
+        assert len(self.empire.blockchain.chain) == blocks_before + 2
+        assert self.empire.get_plant_history("plant-2")[0]["data"]["data"]["strain"] == "Strain B"
+        assert self.empire.get_system_stats()["total_plants"] == 2
+    
+    def test_list_plants_by_pod(self):
+        """Test filtering plants by pod, including harvested plants"""
+        self.empire.create_pod("pod-1", "Pod 1", 5)
+        self.empire.create_pod("pod-2", "Pod 2", 5)
+        self.empire.add_plant("plant-1", "OG Kush", "pod-1")
+        self.empire.add_plant("plant-2", "Blue Dream", "pod-2")
+        self.empire.add_plant("plant-3", "Sour Diesel", "pod-1")
+        self.empire.record_harvest("plant-1", yield_amount=100.0, quality_score=8.0)
+        
+        assert [p.id for p in self.empire.list_plants(pod_id="pod-1")] == ["plant-1", "plant-3"]
+        assert [p.id for p in self.empire.list_plants(pod_id="pod-2")] == ["plant-2"]
+        assert self.empire.list_plants(pod_id="missing") == []
+        assert len(self.empire.list_plants()) == 3
+    
+    def test_pinned_request_time(self):
+        """Test operations within a pinned request share one timestamp"""
+        pinned = datetime(2024, 1, 1, 12, 0, 0)
+        token = pin_request_time(pinned)
+        try:
+            self.empire.create_pod("pod-1", "Test Pod", 5)
+            plant = self.empire.add_plant("plant-1", "OG Kush", "pod-1")
+            harvest = self.empire.record_harvest("plant-1", yield_amount=100.0, quality_score=8.0)
+        finally:
+            release_request_time(token)
+        
+        assert plant.planted_date == pinned
+        assert harvest['harvest_date'] == pinned.isoformat()
+        assert harvest['days_to_harvest'] == 0
+    
     def test_add_plant_to_nonexistent_pod(self):
         """Test adding plant to non-existent pod raises error"""
         with pytest.raises(ValueError):
@@ -107,14 +184,16 @@ class TestGrowPodEmpire:
         """Test environmental analytics"""
         self.empire.create_pod("pod-1", "Test Pod", 5)
         
+        # Only the temperature varies, so copy one validated reading
+        base = EnvironmentalCondition(
+            temperature=24.0,
+            humidity=55.0,
+            co2_level=1200,
+            light_intensity=600,
+            ph_level=6.5
+        )
         for i in range(3):
-            conditions = EnvironmentalCondition(
-                temperature=24.0 + i,
-                humidity=55.0,
-                co2_level=1200,
-                light_intensity=600,
-                ph_level=6.5
-            )
+            conditions = base.model_copy(update={"temperature": base.temperature + i})
             self.empire.record_environment("pod-1", conditions)
         
         analytics = self.empire.get_environment_analytics("pod-1")
@@ -157,6 +236,7 @@ class TestGrowPodEmpire:
         
         history = self.empire.get_plant_history("plant-1")
         assert len(history) >= 2  # At least planted + stage change
+        json.dumps(history)  # Payloads stay plain JSON for any encoder
     
     def test_system_stats(self):
         """Test system statistics"""
@@ -169,6 +249,55 @@ class TestGrowPodEmpire:
         assert stats['active_plants'] == 1
         assert 'blockchain' in stats
         assert stats['data_integrity'] is True
+    
+    def test_system_stats_track_stage_changes(self):
+        """Test stage counts follow stage updates and harvests"""
+        self.empire.create_pod("pod-1", "Test Pod", 5)
+        self.empire.add_plant("plant-1", "OG Kush", "pod-1")
+        self.empire.add_plant("plant-2", "Blue Dream", "pod-1")
+        self.empire.update_plant_stage("plant-1", GrowthStage.VEGETATIVE)
+        self.empire.record_harvest("plant-2", yield_amount=100.0, quality_score=8.0)
+        
+        stats = self.empire.get_system_stats()
+        assert stats['total_plants'] == 2
+        assert stats['active_plants'] == 1
+        assert stats['plants_by_stage']['vegetative'] == 1
+        assert stats['plants_by_stage']['seed'] == 0
+        assert stats['plants_by_stage']['harvest'] == 0
+
+
+class TestModels:
+    """Test suite for data models"""
+    
+    def test_environmental_condition_is_frozen(self):
+        """Test recorded readings cannot be edited in place"""
+        conditions = EnvironmentalCondition(
+            temperature=24.0,
+            humidity=50.0,
+            co2_level=1000,
+            light_intensity=500,
+            ph_level=6.5
+        )
+        with pytest.raises(ValidationError):
+            conditions.temperature = 30.0
+        assert hash(conditions) == hash(conditions.model_copy())
+    
+    def test_fast_dict_matches_model_dump(self):
+        """Test fast_dict mirrors model_dump for each model"""
+        conditions = EnvironmentalCondition(
+            temperature=24.0,
+            humidity=50.0,
+            co2_level=1200,
+            light_intensity=600,
+            ph_level=6.5
+        )
+        pod = GrowPod(id="pod-1", name="Test Pod", capacity=5, current_conditions=conditions)
+        plant = Plant(id="plant-1", strain="OG Kush", pod_id="pod-1", metadata={"tag": 1})
+        
+        assert conditions.fast_dict() == conditions.model_dump()
+        assert pod.fast_dict() == pod.model_dump()
+        assert plant.fast_dict() == plant.model_dump()
+        assert list(plant.fast_dict()) == list(plant.model_dump())
 
 
 class TestGrowthTracker:
@@ -188,6 +317,32 @@ class TestGrowthTracker:
         assert metrics['growth_rate'] is not None
         assert metrics['growth_rate'] > 0
     
+    def test_record_growth_batch(self):
+        """Test a batch of measurements is tracked in full and recorded as one block"""
+        blocks_before = len(self.empire.blockchain.chain)
+        results = self.empire.record_growth_batch("plant-1", [(10.0, 4), (12.0, None), (14.5, 6)])
+        
+        assert [result['height'] for result in results] == [10.0, 12.0, 14.5]
+        assert results[0]['leaf_count'] == 4
+        assert self.empire.get_plant("plant-1").height == 14.5
+        assert len(self.empire.blockchain.chain) == blocks_before + 1
+        
+        block = self.empire.blockchain.chain[-1]
+        assert block.data["data"]["action"] == "growth_measurements"
+        assert len(block.data["data"]["measurements"]) == 3
+        assert self.empire.record_growth_batch("plant-1", []) == []
+        
+        # Timestamped samples get growth rates between them
+        start = datetime.now() + timedelta(days=1)
+        timed = self.empire.record_growth_batch(
+            "plant-1", [(16.5, None), (18.5, 7)], timestamps=[start, start + timedelta(days=1)]
+        )
+        assert timed[1]['growth_rate'] == 2.0
+        assert timed[1]['leaf_count'] == 7
+        
+        with pytest.raises(ValueError):
+            self.empire.record_growth_batch("missing", [(1.0, None)])
+    
     def test_health_score_adjustment(self):
         """Test health score adjustment based on growth"""
         plant = self.empire.get_plant("plant-1")
@@ -200,6 +355,59 @@ class TestGrowthTracker:
         plant = self.empire.get_plant("plant-1")
         # Health score should be updated
         assert plant.health_score is not None
+    
+    def test_growth_update_math(self):
+        """Test growth rate and health adjustment for slow, fast and instant samples"""
+        day = 86400.0
+        assert _growth_update(0.0, 10.0, day, 12.0, 80.0, 2.0) == (2.0, 80.0)
+        assert _growth_update(0.0, 10.0, day, 10.5, 80.0, 2.0) == (0.5, 70.0)
+        assert _growth_update(0.0, 10.0, day, 14.0, 98.0, 2.0) == (4.0, 100)
+        assert _growth_update(day, 10.0, day, 14.0, 80.0, 2.0) == (None, 80.0)
+    
+    def test_track_growth_bulk(self):
+        """Test bulk measurements get per-sample rates and carried health scores"""
+        tracker = self.empire.growth_tracker
+        plant = self.empire.get_plant("plant-1")
+        plant.growth_stage = GrowthStage.VEGETATIVE
+        start = datetime.now() - timedelta(days=5)
+        timestamps = [start + timedelta(days=i) for i in range(5)]
+        
+        batch = tracker.track_growth_bulk(plant, [10.0, 12.0, 12.5, 17.0, 19.0], timestamps)
+        assert [m.growth_rate for m in batch] == [None, 2.0, 0.5, 4.5, 2.0]
+        assert [m.health_score for m in batch] == [100.0, 100.0, 90.0, 95.0, 95.0]
+        assert [m.timestamp for m in batch] == timestamps
+        assert all(m.predicted_harvest_date is not None for m in batch)
+        
+        # A later run continues from the last stored sample
+        later = tracker.track_growth_bulk(plant, [21.0], [start + timedelta(days=6)])
+        assert later[0].growth_rate == 1.0
+        
+        analytics = tracker.get_growth_analytics("plant-1")
+        assert analytics['total_measurements'] == 6
+        assert analytics['average_growth_rate'] == 2.0
+        assert analytics['min_height'] == 10.0
+        assert analytics['mean_height'] == 15.25
+        
+        with pytest.raises(ValueError):
+            tracker.track_growth_bulk(plant, [1.0], [])
+    
+    def test_remaining_days_by_stage(self):
+        """Test the days-to-harvest table sums the durations of later stages"""
+        tracker = self.empire.growth_tracker
+        assert tracker._cumulative_remaining == [114, 111, 104, 90, 60, 0]
+        
+        # Durations are changed through the tracker, which rebuilds the table
+        tracker.set_stage_duration(GrowthStage.SEED, 100)
+        assert tracker._cumulative_remaining[:2] == [211, 111]
+        tracker.stage_durations = {GrowthStage.FLOWERING: 60}
+        assert tracker._cumulative_remaining == [60, 60, 60, 60, 60, 0]
+        with pytest.raises(TypeError):
+            tracker.stage_durations[GrowthStage.SEED] = 1
+        
+        self.empire.update_plant_stage("plant-1", GrowthStage.FLOWERING)
+        self.empire.record_growth("plant-1", height=10.0)
+        predicted = tracker.growth_history["plant-1"].latest.predicted_harvest_date
+        assert (predicted - datetime.now()).days in (59, 60)
 
 
 class TestEnvironmentalMonitor:
@@ -238,6 +446,105 @@ class TestEnvironmentalMonitor:
         
         result = self.empire.record_environment("pod-1", conditions)
         assert len(result['alerts']) > 0
+    
+    def test_environment_analytics_window(self):
+        """Test analytics cover recent samples and fall back to the latest ones"""
+        old = datetime.now() - timedelta(days=3)
+        base = EnvironmentalCondition(
+            timestamp=old,
+            temperature=20.0,
+            humidity=50.0,
+            co2_level=1000,
+            light_intensity=500,
+            ph_level=6.5
+        )
+        for i in range(12):
+            self.empire.record_environment("pod-1", base.model_copy(update={
+                "timestamp": old + timedelta(minutes=i),
+                "temperature": 20.0 + i
+            }))
+        
+        # Nothing within the last 24h, so the last 10 samples are used
+        analytics = self.empire.get_environment_analytics("pod-1")
+        assert analytics['measurements'] == 10
+        assert analytics['temperature']['min'] == 22.0
+        assert analytics['temperature']['max'] == 31.0
+        assert analytics['overall_status'] == 'critical'
+        
+        analytics = self.empire.get_environment_analytics("pod-1", hours=24 * 7)
+        assert analytics['measurements'] == 12
+        assert analytics['temperature']['average'] == 25.5
+        assert analytics['humidity']['std_dev'] == 0.0
+    
+    def test_condition_history_keeps_latest_samples(self):
+        """Test a pod's history is bounded and keeps its newest samples in order"""
+        monitor = EnvironmentalMonitor(history_capacity=5)
+        start = datetime.now() - timedelta(hours=1)
+        base = EnvironmentalCondition(
+            timestamp=start,
+            temperature=0.0,
+            humidity=50.0,
+            co2_level=1000,
+            light_intensity=500,
+            ph_level=6.5
+        )
+        for i in range(23):
+            monitor.record_conditions("pod-1", base.model_copy(update={
+                "timestamp": start + timedelta(seconds=i),
+                "temperature": float(i)
+            }))
+        
+        history = monitor.condition_history["pod-1"]
+        assert len(history) == 5
+        assert list(history.window(start)[0]) == [18.0, 19.0, 20.0, 21.0, 22.0]
+        assert monitor.get_environment_analytics("pod-1")['measurements'] == 5
+    
+    def test_record_environment_batch(self):
+        """Test batched readings are stored, classified and recorded as one block"""
+        readings = np.zeros(4, dtype=[(name, 'f8') for name in CONDITION_COLUMNS])
+        readings['temperature'] = [24.0, 35.0, 10.0, 25.0]
+        readings['humidity'] = 50.0
+        readings['co2_level'] = 1000
+        readings['light_intensity'] = 500
+        readings['ph_level'] = 6.5
+        start = datetime.now() - timedelta(minutes=10)
+        timestamps = [start + timedelta(minutes=i) for i in range(4)]
+        blocks_before = len(self.empire.blockchain.chain)
+        
+        result = self.empire.record_environment_batch("pod-1", readings, timestamps)
+        assert result['recorded'] == 4
+        assert result['critical_samples']['temperature'] == 2
+        assert result['critical_samples']['humidity'] == 0
+        assert len(self.empire.blockchain.chain) == blocks_before + 1
+        
+        conditions = self.empire.get_pod("pod-1").current_conditions
+        assert conditions.temperature == 25.0
+        assert conditions.timestamp == timestamps[-1]
+        
+        analytics = self.empire.get_environment_analytics("pod-1")
+        assert analytics['measurements'] == 4
+        assert analytics['temperature']['max'] == 35.0
+    
+    def test_environment_window_with_out_of_order_samples(self):
+        """Test late-arriving samples are still filtered by timestamp"""
+        now = datetime.now()
+        base = EnvironmentalCondition(
+            timestamp=now,
+            temperature=20.0,
+            humidity=50.0,
+            co2_level=1000,
+            light_intensity=500,
+            ph_level=6.5
+        )
+        for hours_ago, temperature in [(1, 21.0), (30, 22.0), (2, 23.0)]:
+            self.empire.record_environment("pod-1", base.model_copy(update={
+                "timestamp": now - timedelta(hours=hours_ago),
+                "temperature": temperature
+            }))
+        
+        analytics = self.empire.get_environment_analytics("pod-1")
+        assert analytics['measurements'] == 2
+        assert analytics['temperature']['average'] == 22.0
 
 
 class TestBlockchain:
@@ -261,6 +568,23 @@ class TestBlockchain:
         assert len(history) > 0
         assert history[0]['data']['type'] == 'plant_data'
     
+    def test_blockchain_records_embedded_models(self):
+        """Test block data may embed models, hashed like their dumped form"""
+        conditions = EnvironmentalCondition(
+            temperature=24.0,
+            humidity=50.0,
+            co2_level=1200,
+            light_intensity=600,
+            ph_level=6.5
+        )
+        blockchain = self.empire.blockchain
+        blockchain.record_environmental_data("pod-1", {"conditions": conditions})
+        block = blockchain.get_latest_block()
+        
+        assert blockchain.verify_chain() is True
+        block.data["data"] = {"conditions": conditions.model_dump()}
+        assert block.calculate_hash() == block.hash
+    
     def test_blockchain_verification(self):
         """Test blockchain verification"""
         self.empire.create_pod("pod-1", "Test Pod", 5)
@@ -268,6 +592,296 @@ class TestBlockchain:
         
         # Blockchain should be valid
         assert self.empire.blockchain.verify_chain() is True
+    
+    def test_blockchain_detects_tampering(self):
+        """Test modified block data fails verification"""
+        self.empire.create_pod("pod-1", "Test Pod", 5)
+        self.empire.add_plant("plant-1", "Test Strain", "pod-1")
+        
+        self.empire.blockchain.chain[1].data["data"]["strain"] = "Other Strain"
+        assert self.empire.blockchain.verify_chain() is False
+        # A failed block stays unverified on later calls
+        assert self.empire.blockchain.verify_chain() is False
+    
+    def test_blockchain_verification_is_incremental(self, monkeypatch):
+        """Test only blocks added since the last check are re-hashed"""
+        blockchain = self.empire.blockchain
+        self.empire.create_pod("pod-1", "Test Pod", 5)
+        self.empire.add_plant("plant-1", "Test Strain", "pod-1")
+        assert blockchain.verify_chain() is True
+        
+        self.empire.update_plant_stage("plant-1", GrowthStage.SEEDLING)
+        rehashed = []
+        original = Block.calculate_hash
+        monkeypatch.setattr(Block, "calculate_hash", lambda block: rehashed.append(block.block_number) or original(block))
+        
+        assert blockchain.verify_chain() is True
+        assert rehashed == [len(blockchain.chain) - 1]
+    
+    def test_full_verification_detects_later_tampering(self):
+        """Test a full audit re-hashes blocks that were already verified"""
+        self.empire.create_pod("pod-1", "Test Pod", 5)
+        self.empire.add_plant("plant-1", "Test Strain", "pod-1")
+        assert self.empire.verify_data_integrity() is True
+        
+        self.empire.blockchain.chain[1].data["data"]["strain"] = "Other Strain"
+        assert self.empire.verify_data_integrity(full=True) is False
+        assert self.empire.verify_data_integrity() is False
+    
+    def test_parallel_verification(self, monkeypatch):
+        """Test threaded re-hashing finds the same first tampered block"""
+        monkeypatch.setattr(cultivation_chain, "PARALLEL_VERIFY_MIN_BLOCKS", 1)
+        monkeypatch.setattr(cultivation_chain.os, "cpu_count", lambda: 3)
+        blockchain = self.empire.blockchain
+        blockchain.add_blocks({"type": "plant_data", "id": f"plant-{i}", "data": {"height": i}} for i in range(10))
+        assert blockchain.verify_chain(full=True) is True
+        
+        blockchain.chain[7].data["data"]["height"] = 0
+        assert blockchain.verify_chain(full=True) is False
+        assert blockchain._verified_through == 6
+    
+    def test_injected_hash_function(self):
+        """Test a custom hash_fn is used for block hashes and Merkle nodes"""
+        def short_hash(payload):
+            return payload[:8].ljust(8, b"\0")
+        
+        empire = GrowPodEmpire(hash_fn=short_hash)
+        empire.create_pod("pod-1", "Test Pod", 5)
+        empire.add_plant("plant-1", "Test Strain", "pod-1")
+        empire.add_plant("plant-2", "Test Strain", "pod-1")
+        
+        blockchain = empire.blockchain
+        assert all(len(block.hash) == 8 for block in blockchain.chain)
+        assert len(blockchain.get_merkle_root()) == 16
+        assert empire.verify_data_integrity(full=True) is True
+        assert empire.verify_data_integrity(batch_leaves=[1, 2]) is True
+        assert len(self.empire.blockchain.chain[0].hash) == 32
+    
+    def test_lazy_verification_checks_tip_link(self):
+        """Test lazy verification only looks at the newest block's link"""
+        assert self.empire.verify_data_integrity(lazy=True) is True
+        self.empire.create_pod("pod-1", "Test Pod", 5)
+        self.empire.add_plant("plant-1", "Test Strain", "pod-1")
+        self.empire.add_plant("plant-2", "Test Strain", "pod-1")
+        
+        self.empire.blockchain.chain[1].data["data"]["strain"] = "Other Strain"
+        assert self.empire.verify_data_integrity(lazy=True) is True
+        assert self.empire.verify_data_integrity(full=True) is False
+        
+        self.empire.blockchain.chain[-1].previous_hash = b"\x00" * 32
+        assert self.empire.verify_data_integrity(lazy=True) is False
+    
+    def test_full_verification_detects_header_tampering(self):
+        """Test edits to cached header fields still change the block hash"""
+        self.empire.create_pod("pod-1", "Test Pod", 5)
+        self.empire.add_plant("plant-1", "Test Strain", "pod-1")
+        assert self.empire.verify_data_integrity() is True
+        
+        self.empire.blockchain.chain[1].timestamp -= timedelta(days=1)
+        assert self.empire.verify_data_integrity(full=True) is False
+    
+    def test_merkle_root_and_inclusion_proofs(self):
+        """Test the incremental Merkle root and per-block inclusion proofs"""
+        blockchain = self.empire.blockchain
+        self.empire.create_pod("pod-1", "Test Pod", 10)
+        for i in range(6):
+            self.empire.add_plant(f"plant-{i}", "Test Strain", "pod-1")
+        
+        # Rebuild the tree from scratch and compare roots
+        level = [block.hash for block in blockchain.chain]
+        while len(level) > 1:
+            level = [
+                hashlib.sha256(level[i] + level[i + 1]).digest() if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+        root = blockchain.get_merkle_root()
+        assert root == level[0].hex()
+        assert blockchain.get_chain_info()["merkle_root"] == root
+        
+        for block in blockchain.chain:
+            proof = blockchain.prove_inclusion(block.block_number)
+            assert blockchain.verify_inclusion(block.hash.hex(), proof, root) is True
+        assert blockchain.verify_inclusion(blockchain.chain[0].hash.hex(), blockchain.prove_inclusion(1), root) is False
+        
+        with pytest.raises(ValueError):
+            blockchain.prove_inclusion(len(blockchain.chain))
+    
+    def test_merkle_root_readable_during_writes(self):
+        """Test the Merkle root can be read while another thread adds blocks"""
+        blockchain = self.empire.blockchain
+        errors = []
+        done = threading.Event()
+        
+        def read_roots():
+            while not done.is_set():
+                try:
+                    blockchain.get_chain_info()
+                except Exception as e:
+                    errors.append(e)
+        
+        reader = threading.Thread(target=read_roots)
+        reader.start()
+        try:
+            for i in range(5000):
+                blockchain.add_block({"type": "plant_data", "id": f"plant-{i}"})
+        finally:
+            done.set()
+            reader.join()
+        assert errors == []
+        assert self.empire.verify_data_integrity(batch_leaves=[1, 2500, 5000]) is True
+    
+    def test_multi_leaf_proofs(self):
+        """Test a multi-leaf proof verifies selected blocks and catches tampering"""
+        blockchain = self.empire.blockchain
+        blockchain.add_blocks({"type": "plant_data", "id": f"plant-{i}"} for i in range(12))
+        selected = [2, 3, 7, 11]
+        
+        proof = blockchain.prove_inclusion_multi(selected)
+        assert len(proof) < sum(len(blockchain.prove_inclusion(n)) for n in selected)
+        assert self.empire.verify_data_integrity(batch_leaves=selected) is True
+        
+        blockchain.chain[7].data["id"] = "other"
+        assert self.empire.verify_data_integrity(batch_leaves=selected) is False
+        assert self.empire.verify_data_integrity(batch_leaves=[2, 3]) is True
+        
+        with pytest.raises(ValueError):
+            blockchain.prove_inclusion_multi([len(blockchain.chain)])
+    
+    def test_add_blocks_batch(self):
+        """Test batched block ingestion links blocks and updates the Merkle root"""
+        blockchain = self.empire.blockchain
+        blockchain.add_block({"type": "plant_data", "id": "plant-0"})
+        records = blockchain.add_blocks({"type": "plant_data", "id": f"plant-{i}"} for i in range(1, 8))
+        
+        assert [record.block_number for record in records] == list(range(2, 9))
+        assert records[0].previous_hash == blockchain.chain[1].hash.hex()
+        assert blockchain.verify_chain() is True
+        
+        level = [block.hash for block in blockchain.chain]
+        while len(level) > 1:
+            level = [
+                hashlib.sha256(level[i] + level[i + 1]).digest() if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+        assert blockchain.get_merkle_root() == level[0].hex()
+        assert blockchain.add_blocks([]) == []
+    
+    def test_records_by_type_and_id(self):
+        """Test record lookups return matching blocks in chain order"""
+        blockchain = self.empire.blockchain
+        self.empire.create_pod("pod-1", "Test Pod", 5)
+        self.empire.add_plant("plant-1", "Test Strain", "pod-1")
+        self.empire.add_plant("plant-2", "Test Strain", "pod-1")
+        blockchain.add_blocks([
+            {"type": "plant_data", "id": "plant-1", "data": {"action": "note"}},
+            {"type": "harvest", "id": "plant-2", "data": {}},
+        ])
+        
+        history = blockchain.get_records_by_id("plant-1")
+        assert [record["data"]["data"]["action"] for record in history] == ["planted", "note"]
+        assert [record["block_number"] for record in blockchain.get_records_by_type("harvest")] == [4]
+        assert len(blockchain.get_records_by_type("plant_data")) == 3
+        assert blockchain.get_records_by_type("genesis") == []
+        assert blockchain.get_records_by_id("missing") == []
+    
+    def test_hashes_are_raw_internally_and_hex_at_the_boundary(self):
+        """Test blocks keep raw digests while records and info expose hex"""
+        blockchain = self.empire.blockchain
+        record = blockchain.record_plant_data("plant-1", {"action": "note"})
+        block = blockchain.chain[record.block_number]
+        
+        assert len(block.hash) == 32
+        assert blockchain.chain[0].previous_hash == b"\x00" * 32
+        assert record.data_hash == block.hash.hex()
+        assert record.previous_hash == blockchain.chain[0].hash.hex()
+        assert blockchain.get_chain_info()["latest_block"]["hash"] == record.data_hash
+    
+    def test_block_lookup_keys(self):
+        """Test blocks expose their record type and id for lookups"""
+        blockchain = self.empire.blockchain
+        blockchain.add_blocks([{"type": "harvest", "id": 7}, {"data": "untyped"}])
+        
+        assert [block.record_id for block in blockchain.chain[1:]] == ["7", "unknown"]
+        assert len(blockchain.get_records_by_id("7")) == 1
+        assert len(blockchain.get_records_by_type("unknown")) == 1
+    
+    def test_record_and_block_share_timestamp(self):
+        """Test a recorded event and its block carry the same timestamp"""
+        record = self.empire.blockchain.record_plant_data("plant-1", {"action": "note"})
+        block = self.empire.blockchain.chain[record.block_number]
+        assert block.timestamp == record.timestamp
+        assert block.data["timestamp"] == block.timestamp.isoformat()
+
+
+class TestAPI:
+    """Test suite for the Flask API"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.empire = GrowPodEmpire()
+        self.client = create_app(self.empire).test_client()
+        self.client.post('/api/pods', json={"id": "pod-1", "name": "Test Pod", "capacity": 500})
+    
+    def test_state_lock_holds_readers_during_writes(self):
+        """Test a reader only gets in once the writer has finished"""
+        lock = _ReadWriteLock()
+        entered = threading.Event()
+        
+        def read():
+            with lock.reading():
+                entered.set()
+        
+        with lock.writing():
+            reader = threading.Thread(target=read)
+            reader.start()
+            assert not entered.wait(0.05)
+        reader.join()
+        assert entered.is_set()
+    
+    def test_stats_reflect_writes_immediately(self):
+        """Test a write clears the briefly cached /api/stats payload"""
+        self.client.post('/api/plants', json={"id": "plant-1", "strain": "Test Strain", "pod_id": "pod-1"})
+        stats = self.client.get('/api/stats').get_json()
+        assert stats['active_plants'] == 1
+        
+        response = self.client.post('/api/plants/plant-1/harvest', json={"yield_amount": 100.0, "quality_score": 8.0})
+        assert response.status_code == 201
+        refreshed = self.client.get('/api/stats').get_json()
+        assert refreshed['active_plants'] == 0
+        assert refreshed['blockchain']['total_blocks'] == stats['blockchain']['total_blocks'] + 1
+    
+    def test_head_requests_keep_the_stats_cache(self):
+        """Test HEAD is served as a read and does not clear cached stats"""
+        stats = self.client.get('/api/stats').get_json()
+        self.empire.create_pod("pod-2", "Unannounced Pod", 5)
+        assert self.client.head('/api/stats').status_code == 200
+        assert self.client.get('/api/stats').get_json() == stats
+    
+    def test_reads_during_writes(self):
+        """Test GETs stay consistent while another thread adds plants"""
+        failures = []
+        done = threading.Event()
+        
+        def read_listings():
+            client = self.client.application.test_client()
+            while not done.is_set():
+                for url in ('/api/plants', '/api/pods', '/api/stats', '/api/blockchain/info'):
+                    response = client.get(url)
+                    if response.status_code != 200:
+                        failures.append(url)
+        
+        reader = threading.Thread(target=read_listings)
+        reader.start()
+        try:
+            for i in range(200):
+                self.client.post('/api/plants', json={"id": f"plant-{i}", "strain": "Test Strain", "pod_id": "pod-1"})
+        finally:
+            done.set()
+            reader.join()
+        
+        assert failures == []
+        assert len(self.client.get('/api/plants').get_json()) == 200
+        assert self.client.get('/api/blockchain/verify').get_json() == {"valid": True}
 
 
 if __name__ == '__main__':